@@ -1,17 +1,60 @@
 # Módulo que implementa a árvore AVL para o índice remissivo
 # Contém todas as operações de inserção, busca, remoção e funções auxiliares
 
+from array import array
+from bisect import bisect_left
+
+from indice_base import Frequencias, IndiceRemissivo
 from no import No
 
-class ArvoreAVL:
+class ArvoreAVL(IndiceRemissivo):
     # Classe que implementa uma árvore AVL para índice remissivo
+    # É o motor padrão do índice (ver indice_base.py)
+
+    nome = "árvore AVL"
 
     def __init__(self):
         # Inicializa uma árvore AVL vazia.
         self.__raiz = None
         self.total_rotacoes = 0 # Contador de rotações realizadas
+        # Rotações separadas por tipo, nas inserções e nas remoções
+        self.rotacoes_insercao = {"LL": 0, "RR": 0, "LR": 0, "RL": 0}
+        self.rotacoes_remocao = {"LL": 0, "RR": 0, "LR": 0, "RL": 0}
         self.palavras_descartadas = 0 # Contador de palavras repetidas
+        # Palavras agrupadas pela quantidade de linhas, para achar a mais frequente em O(1)
+        self.__frequencias = Frequencias()
+        # Índice de sufixos e trechos (busca_textual.py), criado na primeira busca desse tipo
+        self.__indice_textual = None
+        # Início (em bytes) de cada linha do arquivo fonte, gravado por construir_indice (ver contexto.py)
+        self.inicios_linhas = None
     
+    @classmethod
+    def from_sorted(cls, pares):
+        # Constrói uma árvore perfeitamente balanceada a partir de pares (palavra, linhas)
+        # Os pares precisam estar em ordem alfabética e sem palavras repetidas
+        # Nenhuma rotação é feita: o elemento do meio de cada intervalo vira a raiz da subárvore
+        arvore = cls()
+        pares = list(pares)
+        arvore.__raiz = arvore.__construir_balanceada(pares, 0, len(pares) - 1)
+        for palavra, linhas in pares:
+            arvore.__frequencias.mudar(palavra, 0, len(linhas))
+        return arvore
+
+    def __construir_balanceada(self, pares, inicio, fim):
+        # Função recursiva que monta a subárvore com os pares do intervalo [inicio, fim]
+        # Retorna a raiz da subárvore com a altura já calculada
+        if inicio > fim:
+            return None
+
+        meio = (inicio + fim) // 2
+        palavra, linhas = pares[meio]
+        no = No(palavra, linhas[0])
+        no.linhas = array('I', linhas)
+        no.esquerda = self.__construir_balanceada(pares, inicio, meio - 1)
+        no.direita = self.__construir_balanceada(pares, meio + 1, fim)
+        self.__atualizar_altura(no)
+        return no
+
     def __altura(self, no):
         # Retorna a altura de um nó
         # Recebe a altura do nó e retorna -1 caso seja nulo
@@ -26,12 +69,27 @@ class ArvoreAVL:
             return 0
         return self.__altura(no.esquerda) - self.__altura(no.direita)
     
+    def __tamanho(self, no):
+        # Retorna a quantidade de nós da subárvore, ou 0 caso seja nula
+        if no is None:
+            return 0
+        return no.tamanho
+
+    def __ocorrencias(self, no):
+        # Retorna a soma das linhas de todos os nós da subárvore, ou 0 caso seja nula
+        if no is None:
+            return 0
+        return no.ocorrencias
+
     def __atualizar_altura(self, no):
         # Atualiza a altura de um nó baseado nas alturas de seus filhos
+        # Também atualiza o tamanho e o total de ocorrências da subárvore
         if no is not None:
             altura_esquerda = self.__altura(no.esquerda)
             altura_direita = self.__altura(no.direita)
             no.altura = 1 + max(altura_esquerda, altura_direita)
+            no.tamanho = 1 + self.__tamanho(no.esquerda) + self.__tamanho(no.direita)
+            no.ocorrencias = len(no.linhas) + self.__ocorrencias(no.esquerda) + self.__ocorrencias(no.direita)
     
     def __rotacao_LL(self, A):
         # Recebe o nó desbalanceado
@@ -70,218 +128,357 @@ class ArvoreAVL:
         return A
     
     def inserir(self, palavra, linha):
-        # Recebe o nó desbalanceado
         # Insere uma palavra e sua linha na árvore
         # A função recebe a palavra a ser inserida e o número da linha onde a palavra aparece
-        self.__raiz = self.__inserir_recursivo(self.__raiz, palavra.lower(), linha)
-    
-    def __inserir_recursivo(self, no, palavra, linha):
-        # Função recursiva para inserir um nó na árvore
-        # A função recebe o nó atual da recursão, a palavra a ser inserida e o número da linha e retorna a raiz da subárvore atualizada
-        
-        # Caso base: encontrou a posição para inserir
-        if no is None:
-            return No(palavra, linha)
-        
-        # Se a palavra já existe, apenas adiciona a linha e aumenta 1 no contador de palavras descartadas
-        if palavra == no.palavra:
-            no.adicionar_linha(linha)
-            self.palavras_descartadas += 1
-            return no
-        
-        # Caminha pela árvore
-        if palavra < no.palavra:
-            no.esquerda = self.__inserir_recursivo(no.esquerda, palavra, linha)
+        # A inserção é iterativa: desce guardando o caminho numa pilha e depois sobe por ela
+        # atualizando as alturas e fazendo as rotações necessárias
+        palavra = palavra.lower()
+        caminho = []
+        no = self.__raiz
+
+        # Desce pela árvore até achar a palavra ou uma posição vazia
+        while no is not None:
+            if palavra == no.palavra:
+                # Se a palavra já existe, apenas adiciona a linha e aumenta 1 no contador de palavras descartadas
+                self.palavras_descartadas += 1
+                if no.adicionar_linha(linha):
+                    quantidade = len(no.linhas)
+                    self.__frequencias.mudar(palavra, quantidade - 1, quantidade)
+                    # A linha é nova: todos os nós do caminho ganham uma ocorrência
+                    no.ocorrencias += 1
+                    for ancestral in caminho:
+                        ancestral.ocorrencias += 1
+                self._registrar("inserir", len(caminho), True)
+                return
+            caminho.append(no)
+            if palavra < no.palavra:
+                no = no.esquerda
+            else:
+                no = no.direita
+
+        # Encontrou a posição para inserir
+        filho = No(palavra, linha)
+        self.__frequencias.mudar(palavra, 0, 1)
+        if self.__indice_textual is not None:
+            self.__indice_textual.adicionar(palavra)
+
+        # Sobe pelo caminho religando a subárvore atualizada no pai
+        # "escolhas" conta as comparações de palavras feitas fora do laço (escolha da rotação e religar o pai)
+        escolhas = 0
+        i = len(caminho) - 1
+        while i >= 0:
+            no = caminho[i]
+            if palavra < no.palavra:
+                no.esquerda = filho
+            else:
+                no.direita = filho
+
+            altura_antiga = no.altura
+            esquerda = no.esquerda
+            direita = no.direita
+            altura_esquerda = esquerda.altura if esquerda is not None else -1
+            altura_direita = direita.altura if direita is not None else -1
+            no.altura = 1 + (altura_esquerda if altura_esquerda > altura_direita else altura_direita)
+            no.tamanho += 1
+            no.ocorrencias += 1
+
+            # Verifica o balanceamento e realiza rotações se necessário
+            balanceamento = altura_esquerda - altura_direita
+            if balanceamento > 1 or balanceamento < -1:
+                filho = self.__balancear_insercao(no, palavra, balanceamento)
+                escolhas += 1
+                i -= 1
+                break
+
+            # A altura não mudou: daqui para cima nenhum fator de balanceamento muda
+            if no.altura == altura_antiga:
+                filho = no
+                i -= 1
+                break
+
+            filho = no
+            i -= 1
         else:
-            no.direita = self.__inserir_recursivo(no.direita, palavra, linha)
-        
-        # Atualiza a altura do nó atual
-        self.__atualizar_altura(no)
-        
-        # Verifica o balanceamento e realiza rotações se necessário
-        balanceamento = self.__fator_balanceamento(no)
-        
-        # Caso Esquerda-Esquerda
-        if balanceamento > 1 and palavra < no.esquerda.palavra:
-            self.total_rotacoes += 1
-            return self.__rotacao_LL(no)
-        
+            self.__raiz = filho
+            self._registrar("inserir", len(caminho), False, len(caminho), escolhas)
+            return
+
+        # A subárvore manteve a altura de antes da inserção (com ou sem rotação),
+        # então os ancestrais restantes só ganham um nó e uma ocorrência
+        subida = len(caminho) - 1 - i
+        if i >= 0:
+            escolhas += 1
+            pai = caminho[i]
+            if palavra < pai.palavra:
+                pai.esquerda = filho
+            else:
+                pai.direita = filho
+            while i >= 0:
+                ancestral = caminho[i]
+                ancestral.tamanho += 1
+                ancestral.ocorrencias += 1
+                i -= 1
+        else:
+            self.__raiz = filho
+        self._registrar("inserir", len(caminho), False, subida, escolhas)
+
+    def __balancear_insercao(self, no, palavra, balanceamento):
+        # Escolhe e aplica a rotação de um nó desbalanceado depois de uma inserção
+        # Recebe o nó, a palavra inserida e o fator de balanceamento do nó
+        # Retorna a nova raiz da subárvore
+        self.total_rotacoes += 1
+
+        if balanceamento > 1:
+            # Caso Esquerda-Esquerda
+            if palavra < no.esquerda.palavra:
+                self.rotacoes_insercao["LL"] += 1
+                return self.__rotacao_LL(no)
+            # Caso Esquerda-Direita
+            self.rotacoes_insercao["LR"] += 1
+            return self.__rotacao_LR(no)
+
         # Caso Direita-Direita
-        if balanceamento < -1 and palavra > no.direita.palavra:
-            self.total_rotacoes += 1
+        if palavra > no.direita.palavra:
+            self.rotacoes_insercao["RR"] += 1
             return self.__rotacao_RR(no)
-        
-        # Caso Esquerda-Direita
-        if balanceamento > 1 and palavra > no.esquerda.palavra:
-            self.total_rotacoes += 1
-            return self.__rotacao_LR(no)
-        
         # Caso Direita-Esquerda
-        if balanceamento < -1 and palavra < no.direita.palavra:
-            self.total_rotacoes += 1
-            return self.__rotacao_RL(no)
-        
-        return no
+        self.rotacoes_insercao["RL"] += 1
+        return self.__rotacao_RL(no)
     
     def buscar(self, palavra):
         # Busca uma palavra a ser buscada na árvore
-        # Recebe a palavra a ser procurada e chama uma função recursiva 
-        return self.__buscar_recursivo(self.__raiz, palavra.lower())
+        # Recebe a palavra a ser procurada e desce iterativamente a partir da raiz
+        # Retorna o nó caso encontre e False caso contrário
+        palavra = palavra.lower()
+        no = self.__raiz
+        profundidade = 0
+        while no is not None:
+            if no.palavra == palavra:
+                self._registrar("buscar", profundidade, True)
+                return no
+            profundidade += 1
+            if palavra < no.palavra:
+                no = no.esquerda
+            else:
+                no = no.direita
+        self._registrar("buscar", profundidade, False)
+        return False
     
-    def __buscar_recursivo(self, no, palavra):
-        # Função recursiva para buscar uma palavra
-        # Recebe o nó atual da recursão e a palavra a ser procurada
+    def buscar_muitos(self, palavras):
+        # Busca várias palavras de uma vez
+        # Retorna um dicionário {palavra: nó encontrado ou False}, com as palavras do jeito que foram recebidas
+        # As consultas são ordenadas uma única vez e descem juntas pela árvore: em cada nó, o intervalo
+        # ordenado de consultas é dividido com busca binária entre as que vão para a esquerda e para a direita,
+        # então o caminho comum do topo da árvore é percorrido uma vez só para o lote inteiro
+        chaves = sorted({palavra.lower() for palavra in palavras})
+        encontrados = dict.fromkeys(chaves, False)
 
-        # Caso base 1: nó vazio 
-        if no is None:
-            return False
+        # Pilha de (nó, início, fim) com o intervalo [início, fim) das consultas que ainda descem por aquele nó
+        pilha = [(self.__raiz, 0, len(chaves))] if chaves else []
+        while pilha:
+            no, inicio, fim = pilha.pop()
 
-        # Caso base 2: palavra encontrada
-        if no.palavra == palavra:
-            return no
-        
-        # Caminha pela árvore
-        if palavra < no.palavra:
-            return self.__buscar_recursivo(no.esquerda, palavra)
-        else:
-            return self.__buscar_recursivo(no.direita, palavra)
-    
-    def buscar_por_prefixo(self, prefixo):
-        # Busca todas as palavras que começam com um determinado prefixo.
-        # Recebe o prefixo a ser procurado e chama função recursiva
-
-        resultado = []
-        self.__buscar_prefixo_recursivo(self.__raiz, prefixo.lower(), resultado)
-        # Retorna a lista de prefixos em ordem alfabética
-        return sorted(resultado)
-    
-    def __buscar_prefixo_recursivo(self, no, prefixo, resultado):
-        # Função recursiva para buscar palavras por prefixo.
-        # Recebe o nó atual da recursão, o prefixo procurado e a lista a ser adicionado o resultado
-        if no is None:
+            if fim - inicio == 1:
+                # Sobrou uma consulta só nesse ramo: termina com a descida comum, sem pilha
+                chave = chaves[inicio]
+                while no is not None:
+                    if chave == no.palavra:
+                        encontrados[chave] = no
+                        break
+                    no = no.esquerda if chave < no.palavra else no.direita
+                continue
+
+            while no is not None:
+                meio = bisect_left(chaves, no.palavra, inicio, fim)
+                direita = meio
+                if meio < fim and chaves[meio] == no.palavra:
+                    encontrados[no.palavra] = no
+                    direita += 1
+                # Segue direto para o lado que ficou com consultas e só empilha o outro se ele também ficou
+                if inicio < meio:
+                    if direita < fim and no.direita is not None:
+                        pilha.append((no.direita, direita, fim))
+                    no, fim = no.esquerda, meio
+                elif direita < fim:
+                    no, inicio = no.direita, direita
+                else:
+                    break
+                if fim - inicio == 1:
+                    pilha.append((no, inicio, fim))
+                    break
+
+        return {palavra: encontrados[palavra.lower()] for palavra in palavras}
+
+    def percorrer_prefixo(self, prefixo, limite=None):
+        # Gerador que produz, em ordem alfabética, as palavras que começam com o prefixo
+        # Desce até a primeira palavra >= prefixo e segue em-ordem até a primeira que não combina,
+        # então o custo é O(log n + k) para k palavras produzidas, sem precisar ordenar nada
+        prefixo = prefixo.lower()
+        if limite is not None and limite <= 0:
             return
-        
-        # Verifica se a palavra atual começa com o prefixo
-        if no.palavra[:len(prefixo)] == prefixo:
-            resultado.append(no.palavra)
-        
-        # Se o prefixo pode estar à esquerda, busca lá
-        if prefixo < no.palavra:
-            self.__buscar_prefixo_recursivo(no.esquerda, prefixo, resultado)
-        
-        # Se o prefixo pode estar à direita, busca lá
-        if prefixo >= no.palavra[:len(prefixo)]:
-            self.__buscar_prefixo_recursivo(no.direita, prefixo, resultado)
 
-    def __contar_elementos(self, no):
-        # Conta o número de elementos de uma subárvore
-        # Recebe a raiz da subárvore
-        if no is None:
-            return 0
-        return 1 + self.__contar_elementos(no.esquerda) + self.__contar_elementos(no.direita)
+        # A pilha guarda os nós >= prefixo no caminho, que são os próximos da ordem alfabética
+        pilha = []
+        no = self.__raiz
+        while no is not None:
+            if no.palavra >= prefixo:
+                pilha.append(no)
+                no = no.esquerda
+            else:
+                no = no.direita
+
+        encontradas = 0
+        while pilha:
+            no = pilha.pop()
+            if not no.palavra.startswith(prefixo):
+                return
+            yield no.palavra
 
-    def buscar_com_medidor_equilibrio(self, palavra):
-        # Busca uma palavra e retorna um medidor de equilibrio
-        # Recebe a palavra a ser buscada
+            encontradas += 1
+            if encontradas == limite:
+                return
+
+            # O sucessor é o nó mais à esquerda da subárvore direita
+            no = no.direita
+            while no is not None:
+                pilha.append(no)
+                no = no.esquerda
+
+    def medidor_equilibrio(self, palavra):
+        # Retorna o Medidor de Equilíbrio (ME) do nó da palavra, ou None se a palavra não estiver na árvore
+        # ME = quantidade de nós da subárvore esquerda - quantidade de nós da subárvore direita
         no = self.buscar(palavra)
         if not no:
-            return -1
-        
-        # Conta elementos nas subárvores
-        elementos_esquerda = self.__contar_elementos(no.esquerda)
-        elementos_direita = self.__contar_elementos(no.direita)
-        
-        me = elementos_esquerda - elementos_direita
-        
-        if me == 0:
-            return 0
-        else:
-            print(f"Medidor de Equilíbrio (ME) para '{palavra}': {me}")
-            return 1
-    
+            return None
+
+        # Quantidade de elementos nas subárvores (já guardada em cada nó)
+        return self.__tamanho(no.esquerda) - self.__tamanho(no.direita)
+
+    def medidores_em_ordem(self):
+        # Gerador com o ME de cada nó em ordem alfabética, lido direto dos nós, sem uma busca por palavra
+        for no in self.nos_em_ordem():
+            yield self.__tamanho(no.esquerda) - self.__tamanho(no.direita)
+
+    def buscar_por_sufixo(self, sufixo, limite=None):
+        # Retorna as palavras que terminam com o sufixo (ver busca_textual.py)
+        return self.__textual().terminadas_em(sufixo.lower(), limite)
+
+    def buscar_por_trecho(self, trecho, limite=None):
+        # Retorna, em ordem alfabética, as palavras que contêm o trecho em qualquer posição
+        return self.__textual().contendo(trecho.lower(), limite)
+
+    def __textual(self):
+        # Monta o índice de sufixos e trechos na primeira vez que ele é usado
+        # Depois disso, inserir e remover o mantêm atualizado a cada palavra nova ou removida
+        if self.__indice_textual is None:
+            from busca_textual import IndiceTextual  # importado aqui porque busca_textual também importa avl
+            self.__indice_textual = IndiceTextual(no.palavra for no in self.nos_em_ordem())
+        return self.__indice_textual
+
     def palavra_mais_frequente(self):
         # Encontra a palavra que aparece em mais linhas diferente
         # Retorna uma lista: [palavra, número de linhas] caso a árvore não estiver vazia
+        # Lê direto do grupo da maior quantidade, em O(1); no empate vale a palavra que chegou primeiro ao grupo
 
         # Caso a árvore estiver vazia, retorna a tupla: (None, 0)
-        if self.__raiz is None:
-            return None, 0
-        
-        max_palavra = [None, 0]  # [palavra, quantidade de linhas]
-        self.__encontrar_mais_frequente(self.__raiz, max_palavra)
-        return max_palavra
-    
-    def __encontrar_mais_frequente(self, no, max_palavra):
-        # Função recursiva para encontrar a palavra mais frequente
-        if no is None:
-            return
-        
-        # Verifica se este nó tem mais linhas que o máximo atual
-        num_linhas = len(no.linhas)
-        if num_linhas > max_palavra[1]:
-            max_palavra[0] = no.palavra
-            max_palavra[1] = num_linhas
-        
-        # Continua a busca nas subárvores
-        self.__encontrar_mais_frequente(no.esquerda, max_palavra)
-        self.__encontrar_mais_frequente(no.direita, max_palavra)
+        return self.__frequencias.mais_frequente()
+
+    def mais_frequentes(self, k):
+        # Retorna as k palavras que aparecem em mais linhas, como uma lista de pares (palavra, número de linhas)
+        # Só as k maiores quantidades são consultadas, e cada grupo é lido até completar as k palavras
+        return self.__frequencias.mais_frequentes(k)
+
+    def reordenar_frequencias(self, ranking):
+        # Troca a ordem de desempate das palavras mais frequentes pela ordem de ranking (ver indice_base.py)
+        self.__frequencias.reordenar(ranking)
 
     def remover(self, palavra, linha=None):
         # Remove uma palavra ou uma linha específica de uma palavra
         # Recebe a palavra a ser removida e uma linha (opcional) a ser removida
         # Retorna True se for bem sucedido, False se contrário
+        # A remoção é iterativa: desce guardando o caminho numa pilha e depois sobe rebalanceando
 
         palavra = palavra.lower()
-        resultado = [False]
-        self.__raiz = self.__remover_recursivo(self.__raiz, palavra, linha, resultado)
-        return resultado[0]
+        caminho = []
+        no = self.__raiz
 
-    def __remover_recursivo(self, no, palavra, linha, resultado):
-        # Função recursiva para remover um nó ou linha
-        # Recebe o nó atual da recursão, a paavra a ser removida, a linha (se não tiver, None) e o resultado(booleano)
-        if no is None:
-            return no
-        
         # Navega até encontrar a palavra
-        if palavra < no.palavra:
-            no.esquerda = self.__remover_recursivo(no.esquerda, palavra, linha, resultado)
-        elif palavra > no.palavra:
-            no.direita = self.__remover_recursivo(no.direita, palavra, linha, resultado)
+        while no is not None and no.palavra != palavra:
+            caminho.append(no)
+            if palavra < no.palavra:
+                no = no.esquerda
+            else:
+                no = no.direita
+
+        profundidade = len(caminho)
+        if no is None:
+            self._registrar("remover", profundidade, False)
+            return False
+
+        if linha is not None:
+            # Remove apenas a linha específica
+            encontrou, ficou_vazia = no.remover_linha(linha)
+            if not encontrou:
+                self._registrar("remover", profundidade, True)
+                return False  # linha não existia, não marca sucesso
+            restantes = len(no.linhas)
+            self.__frequencias.mudar(palavra, restantes + 1, restantes)
+            if not ficou_vazia:
+                # O nó continua na árvore: só os contadores de ocorrências do caminho mudam
+                no.ocorrencias -= 1
+                for ancestral in caminho:
+                    ancestral.ocorrencias -= 1
+                self._registrar("remover", profundidade, True)
+                return True
         else:
-            # Palavra encontrada
-            if linha is not None:
-                # Remove apenas a linha específica
-                encontrou, ficou_vazia = no.remover_linha(linha)
-                if not encontrou:
-                    return no  # linha não existia, não marca sucesso
-                if not ficou_vazia:
-                    resultado[0] = True
-                    return no
-                
-            # Se ficou vazia ou remoção total, continua para remover o nó
-            resultado[0] = True
-            
+            # Remoção da palavra inteira: ela sai dos grupos de frequência
+            self.__frequencias.mudar(palavra, len(no.linhas), 0)
+
+        # Se ficou vazia ou remoção total, continua para remover o nó
+        if self.__indice_textual is not None:
+            self.__indice_textual.remover(palavra)
+        if no.esquerda is None:
             # Caso 1: Nó sem filhos ou com apenas um filho
-            if no.esquerda is None:
-                return no.direita
-            elif no.direita is None:
-                return no.esquerda
-            
+            substituto = no.direita
+        elif no.direita is None:
+            substituto = no.esquerda
+        else:
             # Caso 2: Nó com dois filhos
-            # Encontra o sucessor (menor valor da subárvore direita)
-            sucessor = self.__encontrar_minimo(no.direita)
-            
+            # Encontra o sucessor (menor valor da subárvore direita), guardando o caminho até ele
+            caminho.append(no)
+            sucessor = no.direita
+            while sucessor.esquerda is not None:
+                caminho.append(sucessor)
+                sucessor = sucessor.esquerda
+
             # Copia os dados do sucessor para este nó
             no.palavra = sucessor.palavra
-            no.linhas = sucessor.linhas.copy()
-            
-            # Remove o sucessor
-            no.direita = self.__remover_recursivo(no.direita, sucessor.palavra, None, resultado)
-        
-        if no is None:
-            return no
-        
-        # Atualiza altura e balanceia
+            # O sucessor sai da árvore logo em seguida, então o vetor de linhas pode ser reaproveitado
+            no.linhas = sucessor.linhas
+
+            # O nó que sai de fato da árvore passa a ser o sucessor
+            no = sucessor
+            substituto = sucessor.direita
+
+        # Sobe pelo caminho religando as subárvores, atualizando alturas e rebalanceando
+        filho_antigo = no
+        filho = substituto
+        for i in range(len(caminho) - 1, -1, -1):
+            atual = caminho[i]
+            if atual.esquerda is filho_antigo:
+                atual.esquerda = filho
+            else:
+                atual.direita = filho
+            filho_antigo = atual
+            filho = self.__balancear_remocao(atual)
+        self.__raiz = filho
+        # Os nós do caminho além da profundidade da palavra são os do caminho até o sucessor
+        self._registrar("remover", profundidade, True, len(caminho), 0, len(caminho) - profundidade)
+        return True
+
+    def __balancear_remocao(self, no):
+        # Atualiza a altura de um nó depois de uma remoção e rebalanceia se necessário
+        # Retorna a nova raiz da subárvore
         self.__atualizar_altura(no)
         balanceamento = self.__fator_balanceamento(no)
         
@@ -289,61 +486,94 @@ class ArvoreAVL:
         # Caso Esquerda-Esquerda
         if balanceamento > 1 and self.__fator_balanceamento(no.esquerda) >= 0:
             self.total_rotacoes += 1
+            self.rotacoes_remocao["LL"] += 1
             return self.__rotacao_LL(no)
         
         # Caso Esquerda-Direita
         if balanceamento > 1 and self.__fator_balanceamento(no.esquerda) < 0:
             self.total_rotacoes += 1
+            self.rotacoes_remocao["LR"] += 1
             return self.__rotacao_LR(no)
         
         # Caso Direita-Direita
         if balanceamento < -1 and self.__fator_balanceamento(no.direita) <= 0:
             self.total_rotacoes += 1
+            self.rotacoes_remocao["RR"] += 1
             return self.__rotacao_RR(no)
         
         # Caso Direita-Esquerda
         if balanceamento < -1 and self.__fator_balanceamento(no.direita) > 0:
             self.total_rotacoes += 1
+            self.rotacoes_remocao["RL"] += 1
             return self.__rotacao_RL(no)
         
         return no
     
-    def __encontrar_minimo(self, no):
-        # Encontra o nó com menor valor em uma subárvore
-        atual = no
-        while atual.esquerda is not None:
-            atual = atual.esquerda
-        return atual
-    
-    def imprimir_indice(self):
-        # Imprime o índice remissivo completo em ordem alfabética
-        # Retorna uma lista de string
-        resultado = []
-        self.__percorrer_em_ordem(self.__raiz, resultado)
-        return resultado
-    
-    def __percorrer_em_ordem(self, no, resultado):
-        # Percorre a árvore no percurso "em-ordem"
-        # Recebe uma lista para armazenar o resultado
-        if no is not None:
-            self.__percorrer_em_ordem(no.esquerda, resultado)
-            resultado.append(str(no))
-            self.__percorrer_em_ordem(no.direita, resultado)
-    
+    def nos_em_ordem(self):
+        # Gerador que produz os nós da árvore em ordem alfabética
+        # Percurso "em-ordem" iterativo, com uma pilha explícita no lugar da recursão
+        pilha = []
+        no = self.__raiz
+        while pilha or no is not None:
+            # Desce o máximo possível para a esquerda
+            while no is not None:
+                pilha.append(no)
+                no = no.esquerda
+            no = pilha.pop()
+            yield no
+            no = no.direita
+
+    def altura(self):
+        # Retorna a altura da árvore (-1 para a árvore vazia)
+        return self.__altura(self.__raiz)
+
+    def _registrar(self, operacao, profundidade, encontrou, subida=0, escolhas=0, sucessor=0):
+        # Ponto de extensão da instrumentação (ver instrumentacao.py), chamado uma vez no fim de buscar,
+        # inserir e remover com o que a operação percorreu; na ArvoreAVL não faz nada
+        # profundidade: nós da descida diferentes da palavra; encontrou: se a descida parou na palavra
+        # subida: nós com o balanceamento verificado na subida; escolhas: comparações de palavras da
+        # inserção fora da descida e da subida (escolha da rotação e religar o pai); sucessor: nós do
+        # caminho até o sucessor na remoção com dois filhos
+        pass
+
     def contar_palavras_total(self):
         # Conta o total de palavras no índice (inclui repetições em diferentes linhas)
-        return self.__contar_palavras_recursivo(self.__raiz)
-    
-    def __contar_palavras_recursivo(self, no):
-        # Conta recursivamente as palavras
-        # Recebe o no atual da recursão
-        if no is None:
-            return 0
-        
-        # Conta as ocorrências desta palavra + as das subárvores
-        total_linhas = len(no.linhas)
-        return total_linhas + self.__contar_palavras_recursivo(no.esquerda) + self.__contar_palavras_recursivo(no.direita)
+        # A raiz já guarda a soma das linhas de toda a árvore
+        return self.__ocorrencias(self.__raiz)
     
     def contar_palavras_distintas(self):
         # Conta o número de palavras distintas
-        return self.__contar_elementos(self.__raiz)
\ No newline at end of file
+        # A raiz já guarda a quantidade de nós da árvore
+        return self.__tamanho(self.__raiz)
+
+    def rank(self, palavra):
+        # Retorna quantas palavras da árvore vêm antes da palavra recebida em ordem alfabética
+        # Se a palavra existir, o valor é a posição dela no índice (começando em 0)
+        palavra = palavra.lower()
+        posicao = 0
+        no = self.__raiz
+        while no is not None:
+            if palavra <= no.palavra:
+                no = no.esquerda
+            else:
+                posicao += self.__tamanho(no.esquerda) + 1
+                no = no.direita
+        return posicao
+
+    def select(self, k):
+        # Retorna o nó da k-ésima palavra em ordem alfabética (começando em 0)
+        # Retorna False caso k esteja fora do intervalo
+        if k < 0 or k >= self.contar_palavras_distintas():
+            return False
+
+        no = self.__raiz
+        while no is not None:
+            elementos_esquerda = self.__tamanho(no.esquerda)
+            if k < elementos_esquerda:
+                no = no.esquerda
+            elif k == elementos_esquerda:
+                return no
+            else:
+                k -= elementos_esquerda + 1
+                no = no.direita
+        return False
\ No newline at end of file
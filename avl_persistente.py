@@ -0,0 +1,339 @@
+# Módulo com a variante persistente (copy-on-write) da árvore AVL
+# Nenhum nó é alterado depois de ligado à árvore: inserir e remover copiam só os nós do caminho
+# da raiz até a posição alterada (O(log n) nós novos por operação) e reaproveitam todas as outras
+# subárvores. Cada versão da raiz é uma árvore completa e imutável, então um leitor pode pegar um
+# instantâneo em O(1) e percorrê-lo inteiro enquanto outras inserções e remoções continuam.
+#
+# As linhas de uma palavra também não são copiadas a cada versão: o vetor é compartilhado, e cada versão
+# do nó só enxerga as suas primeiras "quantidade" linhas. Como as linhas chegam em ordem crescente, a
+# versão mais nova acrescenta a linha no final do vetor, sem mexer no trecho visto pelas anteriores.
+# A quantidade não ocupa um campo a mais: é ocorrencias menos as ocorrências dos filhos.
+
+from array import array
+from bisect import bisect_left
+
+from no import No
+
+
+def _altura(no):
+    return no.altura if no is not None else -1
+
+
+def _tamanho(no):
+    return no.tamanho if no is not None else 0
+
+
+def _ocorrencias(no):
+    return no.ocorrencias if no is not None else 0
+
+
+def _quantidade(no):
+    # Quantidade de linhas do nó nesta versão (o vetor pode ter mais, acrescentadas por versões mais novas)
+    # Calculada a cada nó do caminho, por isso sem chamar _ocorrencias
+    quantidade = no.ocorrencias
+    if no.esquerda is not None:
+        quantidade -= no.esquerda.ocorrencias
+    if no.direita is not None:
+        quantidade -= no.direita.ocorrencias
+    return quantidade
+
+
+def _visao(no):
+    # Nó avulso com as linhas que o nó tem nesta versão, para quem está fora da árvore
+    visao = No.__new__(No)
+    visao.palavra = no.palavra
+    visao.linhas = no.linhas[:_quantidade(no)]
+    visao.esquerda = no.esquerda
+    visao.direita = no.direita
+    visao.altura = no.altura
+    visao.tamanho = no.tamanho
+    visao.ocorrencias = no.ocorrencias
+    return visao
+
+
+def _no(palavra, linhas, quantidade, esquerda, direita):
+    # Cria um nó novo já com altura, tamanho e ocorrências calculados a partir dos filhos
+    # O nó enxerga as primeiras "quantidade" posições do vetor de linhas, que pode ser de outras versões
+    no = No.__new__(No)
+    no.palavra = palavra
+    no.linhas = linhas
+    no.esquerda = esquerda
+    no.direita = direita
+    no.altura = 1 + max(_altura(esquerda), _altura(direita))
+    no.tamanho = 1 + _tamanho(esquerda) + _tamanho(direita)
+    no.ocorrencias = quantidade + _ocorrencias(esquerda) + _ocorrencias(direita)
+    return no
+
+
+def _rotacao_direita(palavra, linhas, quantidade, esquerda, direita):
+    # Rotação simples à direita do nó (palavra, linhas) com esses filhos, criando nós novos
+    return _no(esquerda.palavra, esquerda.linhas, _quantidade(esquerda), esquerda.esquerda,
+               _no(palavra, linhas, quantidade, esquerda.direita, direita))
+
+
+def _rotacao_esquerda(palavra, linhas, quantidade, esquerda, direita):
+    # Rotação simples à esquerda do nó (palavra, linhas) com esses filhos, criando nós novos
+    return _no(direita.palavra, direita.linhas, _quantidade(direita),
+               _no(palavra, linhas, quantidade, esquerda, direita.esquerda), direita.direita)
+
+
+class Instantaneo:
+    # Versão imutável da árvore, só para leitura
+    # Guarda a raiz de uma versão: as operações seguintes da árvore criam nós novos e não mexem nesta
+
+    def __init__(self, raiz, total_rotacoes=0, palavras_descartadas=0):
+        self.__raiz = raiz
+        self.total_rotacoes = total_rotacoes
+        self.palavras_descartadas = palavras_descartadas
+
+    def __localizar(self, palavra):
+        # Retorna o nó da palavra nesta versão, ou None
+        palavra = palavra.lower()
+        no = self.__raiz
+        while no is not None:
+            if no.palavra == palavra:
+                return no
+            no = no.esquerda if palavra < no.palavra else no.direita
+        return None
+
+    def buscar(self, palavra):
+        # Retorna um nó com a palavra e as linhas desta versão, ou False, como ArvoreAVL.buscar
+        no = self.__localizar(palavra)
+        if no is None:
+            return False
+        return _visao(no)
+
+    def medidor_equilibrio(self, palavra):
+        # Retorna o Medidor de Equilíbrio (ME) do nó da palavra, ou None se ela não estiver na árvore
+        no = self.__localizar(palavra)
+        if no is None:
+            return None
+        return _tamanho(no.esquerda) - _tamanho(no.direita)
+
+    def percorrer_prefixo(self, prefixo, limite=None):
+        # Gerador com as palavras que começam com o prefixo, em ordem alfabética (ver ArvoreAVL.percorrer_prefixo)
+        prefixo = prefixo.lower()
+        if limite is not None and limite <= 0:
+            return
+
+        pilha = []
+        no = self.__raiz
+        while no is not None:
+            if no.palavra >= prefixo:
+                pilha.append(no)
+                no = no.esquerda
+            else:
+                no = no.direita
+
+        encontradas = 0
+        while pilha:
+            no = pilha.pop()
+            if not no.palavra.startswith(prefixo):
+                return
+            yield no.palavra
+
+            encontradas += 1
+            if encontradas == limite:
+                return
+
+            no = no.direita
+            while no is not None:
+                pilha.append(no)
+                no = no.esquerda
+
+    def buscar_por_prefixo(self, prefixo, limite=None):
+        # Retorna a lista das palavras que começam com o prefixo, em ordem alfabética
+        return list(self.percorrer_prefixo(prefixo, limite))
+
+    def __nos(self):
+        # Gerador com os nós desta versão em ordem alfabética, como estão na árvore
+        pilha = []
+        no = self.__raiz
+        while pilha or no is not None:
+            while no is not None:
+                pilha.append(no)
+                no = no.esquerda
+            no = pilha.pop()
+            yield no
+            no = no.direita
+
+    def __iter__(self):
+        # Gerador com os nós em ordem alfabética, com as linhas desta versão (ver _visao)
+        return map(_visao, self.__nos())
+
+    def imprimir_indice(self):
+        # Retorna o índice completo em ordem alfabética, como uma lista de string
+        return [str(no) for no in self]
+
+    def palavra_mais_frequente(self):
+        # Percorre a versão inteira e retorna [palavra, número de linhas], ou (None, 0) se ela estiver vazia
+        if self.__raiz is None:
+            return None, 0
+        no = max(self.__nos(), key=_quantidade)
+        return [no.palavra, _quantidade(no)]
+
+    def altura(self):
+        return _altura(self.__raiz)
+
+    def contar_palavras_total(self):
+        return _ocorrencias(self.__raiz)
+
+    def contar_palavras_distintas(self):
+        return _tamanho(self.__raiz)
+
+
+class ArvoreAVLPersistente:
+    # Árvore AVL com cópia de caminho: mesma interface de escrita da ArvoreAVL, mais instantaneo()
+    # Só uma thread deve escrever por vez; leitores usam instantâneos e nunca precisam de trava
+
+    def __init__(self):
+        self.__raiz = None
+        self.total_rotacoes = 0
+        self.palavras_descartadas = 0
+        self.rotacoes_insercao = {"LL": 0, "RR": 0, "LR": 0, "RL": 0}
+        self.rotacoes_remocao = {"LL": 0, "RR": 0, "LR": 0, "RL": 0}
+
+    def instantaneo(self):
+        # Retorna a versão atual da árvore em O(1)
+        # Trocar a raiz é uma única atribuição, então o leitor sempre pega uma versão completa
+        return Instantaneo(self.__raiz, self.total_rotacoes, self.palavras_descartadas)
+
+    def raiz(self):
+        # Retorna a raiz da versão atual (uma árvore imutável)
+        return self.__raiz
+
+    def __balancear(self, palavra, linhas, quantidade, esquerda, direita, rotacoes):
+        # Cria o nó (palavra, linhas, quantidade) com esses filhos, aplicando uma rotação se ele ficar desbalanceado
+        # As rotações também criam nós novos: os filhos podem pertencer a versões anteriores
+        balanceamento = _altura(esquerda) - _altura(direita)
+
+        if balanceamento > 1:
+            self.total_rotacoes += 1
+            if _altura(esquerda.esquerda) >= _altura(esquerda.direita):
+                # Caso Esquerda-Esquerda
+                rotacoes["LL"] += 1
+            else:
+                # Caso Esquerda-Direita
+                rotacoes["LR"] += 1
+                esquerda = _rotacao_esquerda(esquerda.palavra, esquerda.linhas, _quantidade(esquerda),
+                                             esquerda.esquerda, esquerda.direita)
+            return _rotacao_direita(palavra, linhas, quantidade, esquerda, direita)
+
+        if balanceamento < -1:
+            self.total_rotacoes += 1
+            if _altura(direita.direita) >= _altura(direita.esquerda):
+                # Caso Direita-Direita
+                rotacoes["RR"] += 1
+            else:
+                # Caso Direita-Esquerda
+                rotacoes["RL"] += 1
+                direita = _rotacao_direita(direita.palavra, direita.linhas, _quantidade(direita),
+                                           direita.esquerda, direita.direita)
+            return _rotacao_esquerda(palavra, linhas, quantidade, esquerda, direita)
+
+        return _no(palavra, linhas, quantidade, esquerda, direita)
+
+    def inserir(self, palavra, linha):
+        # Insere a palavra com a linha e publica a nova versão
+        # Retorna a nova raiz (a versão anterior continua intacta)
+        self.__raiz = self.__inserir(self.__raiz, palavra.lower(), linha)
+        return self.__raiz
+
+    def __inserir(self, no, palavra, linha):
+        # Retorna a raiz da nova versão da subárvore; se nada mudou, retorna o próprio nó
+        if no is None:
+            return _no(palavra, array('I', (linha,)), 1, None, None)
+
+        if palavra == no.palavra:
+            self.palavras_descartadas += 1
+            linhas = no.linhas
+            quantidade = _quantidade(no)
+            if linha > linhas[quantidade - 1]:
+                if quantidade == len(linhas):
+                    # Esta é a versão mais nova do vetor: a linha vai no final, e as versões anteriores
+                    # continuam enxergando só as suas primeiras linhas
+                    linhas.append(linha)
+                else:
+                    # Outra versão já acrescentou linhas depois deste trecho: copia só o trecho desta
+                    linhas = linhas[:quantidade]
+                    linhas.append(linha)
+                return _no(palavra, linhas, quantidade + 1, no.esquerda, no.direita)
+
+            # Linha fora de ordem: é o único caso da inserção que copia o vetor
+            posicao = bisect_left(linhas, linha, 0, quantidade)
+            if linhas[posicao] == linha:
+                return no
+            linhas = linhas[:quantidade]
+            linhas.insert(posicao, linha)
+            return _no(palavra, linhas, quantidade + 1, no.esquerda, no.direita)
+
+        if palavra < no.palavra:
+            esquerda = self.__inserir(no.esquerda, palavra, linha)
+            if esquerda is no.esquerda:
+                return no
+            return self.__balancear(no.palavra, no.linhas, _quantidade(no), esquerda, no.direita,
+                                    self.rotacoes_insercao)
+
+        direita = self.__inserir(no.direita, palavra, linha)
+        if direita is no.direita:
+            return no
+        return self.__balancear(no.palavra, no.linhas, _quantidade(no), no.esquerda, direita, self.rotacoes_insercao)
+
+    def remover(self, palavra, linha=None):
+        # Remove uma palavra ou uma linha específica de uma palavra e publica a nova versão
+        # Retorna True se for bem sucedido, False se contrário
+        raiz = self.__remover(self.__raiz, palavra.lower(), linha)
+        if raiz is self.__raiz:
+            return False
+        self.__raiz = raiz
+        return True
+
+    def __remover(self, no, palavra, linha):
+        # Retorna a raiz da nova versão da subárvore; se nada foi removido, retorna o próprio nó
+        if no is None:
+            return None
+
+        if palavra < no.palavra:
+            esquerda = self.__remover(no.esquerda, palavra, linha)
+            if esquerda is no.esquerda:
+                return no
+            return self.__balancear(no.palavra, no.linhas, _quantidade(no), esquerda, no.direita,
+                                    self.rotacoes_remocao)
+
+        if palavra > no.palavra:
+            direita = self.__remover(no.direita, palavra, linha)
+            if direita is no.direita:
+                return no
+            return self.__balancear(no.palavra, no.linhas, _quantidade(no), no.esquerda, direita, self.rotacoes_remocao)
+
+        if linha is not None:
+            quantidade = _quantidade(no)
+            posicao = bisect_left(no.linhas, linha, 0, quantidade)
+            if posicao == quantidade or no.linhas[posicao] != linha:
+                return no
+            if quantidade > 1:
+                # O nó continua na árvore; tirar a última linha só encurta o trecho visto, sem copiar
+                if posicao == quantidade - 1:
+                    return _no(palavra, no.linhas, quantidade - 1, no.esquerda, no.direita)
+                linhas = no.linhas[:quantidade]
+                del linhas[posicao]
+                return _no(palavra, linhas, quantidade - 1, no.esquerda, no.direita)
+
+        # Remove o nó inteiro
+        if no.esquerda is None:
+            return no.direita
+        if no.direita is None:
+            return no.esquerda
+
+        # Dois filhos: o sucessor (menor da subárvore direita) sobe para o lugar do nó, sem alterar nenhum nó existente
+        direita, sucessor = self.__remover_minimo(no.direita)
+        return self.__balancear(sucessor.palavra, sucessor.linhas, _quantidade(sucessor), no.esquerda, direita,
+                                self.rotacoes_remocao)
+
+    def __remover_minimo(self, no):
+        # Retorna (nova subárvore sem o menor nó, menor nó)
+        if no.esquerda is None:
+            return no.direita, no
+        esquerda, minimo = self.__remover_minimo(no.esquerda)
+        return (self.__balancear(no.palavra, no.linhas, _quantidade(no), esquerda, no.direita, self.rotacoes_remocao),
+                minimo)
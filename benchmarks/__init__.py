@@ -0,0 +1,2 @@
+# Pacote com os scripts de medição de desempenho do índice remissivo
+# Cada módulo pode ser executado com "python -m benchmarks.<modulo>" a partir da raiz do projeto
@@ -0,0 +1,344 @@
+# Motor de referência para os benchmarks: a ArvoreAVL recursiva, como era antes da versão iterativa de avl.py
+# Fica aqui só para medir a diferença lado a lado, com os mesmos tokens e as mesmas consultas:
+#   python -m benchmarks.escala --cenarios zipf --modos avl --motor avl benchmarks.avl_recursiva:ArvoreAVLRecursiva
+# Mantém apenas o que o benchmark usa (construção, buscar, buscar_por_prefixo, remover e os contadores);
+# inserir, buscar e remover são os originais, com uma chamada recursiva por nível da árvore
+
+from array import array
+
+from no import No
+
+
+class ArvoreAVLRecursiva:
+    # Árvore AVL recursiva para índice remissivo (referência; o motor usado pelo programa é avl.ArvoreAVL)
+
+    def __init__(self):
+        # Inicializa uma árvore AVL vazia.
+        self.__raiz = None
+        self.total_rotacoes = 0  # Contador de rotações realizadas
+        self.palavras_descartadas = 0  # Contador de palavras repetidas
+
+    @classmethod
+    def from_postings(cls, postagens):
+        # Constrói uma árvore a partir de um dicionário {palavra: linhas}
+        # Ordena as palavras distintas uma única vez e monta a árvore já balanceada
+        return cls.from_sorted((palavra, postagens[palavra]) for palavra in sorted(postagens))
+
+    @classmethod
+    def from_sorted(cls, pares):
+        # Constrói uma árvore perfeitamente balanceada a partir de pares (palavra, linhas)
+        # Os pares precisam estar em ordem alfabética e sem palavras repetidas
+        # Nenhuma rotação é feita: o elemento do meio de cada intervalo vira a raiz da subárvore
+        arvore = cls()
+        pares = list(pares)
+        arvore.__raiz = arvore.__construir_balanceada(pares, 0, len(pares) - 1)
+        return arvore
+
+    def __construir_balanceada(self, pares, inicio, fim):
+        # Função recursiva que monta a subárvore com os pares do intervalo [inicio, fim]
+        # Retorna a raiz da subárvore com a altura já calculada
+        if inicio > fim:
+            return None
+
+        meio = (inicio + fim) // 2
+        palavra, linhas = pares[meio]
+        no = No(palavra, linhas[0])
+        no.linhas = array('I', linhas)
+        no.esquerda = self.__construir_balanceada(pares, inicio, meio - 1)
+        no.direita = self.__construir_balanceada(pares, meio + 1, fim)
+        self.__atualizar_altura(no)
+        return no
+
+    def __altura(self, no):
+        # Retorna a altura de um nó
+        # Recebe a altura do nó e retorna -1 caso seja nulo
+        if no is None:
+            return -1
+        return no.altura
+
+    def __fator_balanceamento(self, no):
+        # Calcula o fator de balanceamento de um nó
+        # Fator de balanceamento = altura da subárvore esquerda - altura da subárvore direita
+        if no is None:
+            return 0
+        return self.__altura(no.esquerda) - self.__altura(no.direita)
+
+    def __tamanho(self, no):
+        # Retorna a quantidade de nós da subárvore, ou 0 caso seja nula
+        if no is None:
+            return 0
+        return no.tamanho
+
+    def __ocorrencias(self, no):
+        # Retorna a soma das linhas de todos os nós da subárvore, ou 0 caso seja nula
+        if no is None:
+            return 0
+        return no.ocorrencias
+
+    def __atualizar_altura(self, no):
+        # Atualiza a altura de um nó baseado nas alturas de seus filhos
+        # Também atualiza o tamanho e o total de ocorrências da subárvore
+        if no is not None:
+            altura_esquerda = self.__altura(no.esquerda)
+            altura_direita = self.__altura(no.direita)
+            no.altura = 1 + max(altura_esquerda, altura_direita)
+            no.tamanho = 1 + self.__tamanho(no.esquerda) + self.__tamanho(no.direita)
+            no.ocorrencias = len(no.linhas) + self.__ocorrencias(no.esquerda) + self.__ocorrencias(no.direita)
+
+    def __rotacao_LL(self, A):
+        # Recebe o nó desbalanceado
+        # Realiza uma rotação simples à direita
+        B = A.esquerda
+        A.esquerda = B.direita
+        B.direita = A
+        self.__atualizar_altura(A)
+        self.__atualizar_altura(B)
+        return B
+
+    def __rotacao_RR(self, A):
+        # Recebe o nó desbalanceado
+        # Realiza uma rotação simples à esquerda
+        B = A.direita
+        A.direita = B.esquerda
+        B.esquerda = A
+        self.__atualizar_altura(A)
+        self.__atualizar_altura(B)
+        return B
+
+    def __rotacao_LR(self, A):
+        # Recebe o nó desbalanceado
+        # Realiza uma rotação simples à esquerda no nó esquerdo do nó desbalanceado
+        # Realiza uma rotação simples à direita no nó desbalanceado
+        A.esquerda = self.__rotacao_RR(A.esquerda)
+        A = self.__rotacao_LL(A)
+        return A
+
+    def __rotacao_RL(self, A):
+        # Recebe o nó desbalanceado
+        # Realiza uma rotação simples à direita no nó direito do nó desbalanceado
+        # Realiza uma rotação simples à esquerda no nó desbalanceado
+        A.direita = self.__rotacao_LL(A.direita)
+        A = self.__rotacao_RR(A)
+        return A
+
+    def inserir(self, palavra, linha):
+        # Recebe o nó desbalanceado
+        # Insere uma palavra e sua linha na árvore
+        # A função recebe a palavra a ser inserida e o número da linha onde a palavra aparece
+        self.__raiz = self.__inserir_recursivo(self.__raiz, palavra.lower(), linha)
+
+    def __inserir_recursivo(self, no, palavra, linha):
+        # Função recursiva para inserir um nó na árvore
+        # A função recebe o nó atual da recursão, a palavra a ser inserida e o número da linha e retorna a raiz da subárvore atualizada
+
+        # Caso base: encontrou a posição para inserir
+        if no is None:
+            return No(palavra, linha)
+
+        # Se a palavra já existe, apenas adiciona a linha e aumenta 1 no contador de palavras descartadas
+        if palavra == no.palavra:
+            no.adicionar_linha(linha)
+            self.palavras_descartadas += 1
+            self.__atualizar_altura(no)
+            return no
+
+        # Caminha pela árvore
+        if palavra < no.palavra:
+            no.esquerda = self.__inserir_recursivo(no.esquerda, palavra, linha)
+        else:
+            no.direita = self.__inserir_recursivo(no.direita, palavra, linha)
+
+        # Atualiza a altura do nó atual
+        self.__atualizar_altura(no)
+
+        # Verifica o balanceamento e realiza rotações se necessário
+        balanceamento = self.__fator_balanceamento(no)
+
+        # Caso Esquerda-Esquerda
+        if balanceamento > 1 and palavra < no.esquerda.palavra:
+            self.total_rotacoes += 1
+            return self.__rotacao_LL(no)
+
+        # Caso Direita-Direita
+        if balanceamento < -1 and palavra > no.direita.palavra:
+            self.total_rotacoes += 1
+            return self.__rotacao_RR(no)
+
+        # Caso Esquerda-Direita
+        if balanceamento > 1 and palavra > no.esquerda.palavra:
+            self.total_rotacoes += 1
+            return self.__rotacao_LR(no)
+
+        # Caso Direita-Esquerda
+        if balanceamento < -1 and palavra < no.direita.palavra:
+            self.total_rotacoes += 1
+            return self.__rotacao_RL(no)
+
+        return no
+
+    def buscar(self, palavra):
+        # Busca uma palavra a ser buscada na árvore
+        # Recebe a palavra a ser procurada e chama uma função recursiva
+        return self.__buscar_recursivo(self.__raiz, palavra.lower())
+
+    def __buscar_recursivo(self, no, palavra):
+        # Função recursiva para buscar uma palavra
+        # Recebe o nó atual da recursão e a palavra a ser procurada
+
+        # Caso base 1: nó vazio
+        if no is None:
+            return False
+
+        # Caso base 2: palavra encontrada
+        if no.palavra == palavra:
+            return no
+
+        # Caminha pela árvore
+        if palavra < no.palavra:
+            return self.__buscar_recursivo(no.esquerda, palavra)
+        else:
+            return self.__buscar_recursivo(no.direita, palavra)
+
+    def buscar_por_prefixo(self, prefixo, limite=None):
+        # Busca todas as palavras que começam com um determinado prefixo.
+        # Recebe o prefixo a ser procurado e chama função recursiva
+        # O limite (mesma assinatura dos motores atuais) só corta o resultado: a busca continua completa
+
+        resultado = []
+        self.__buscar_prefixo_recursivo(self.__raiz, prefixo.lower(), resultado)
+        # Retorna a lista de prefixos em ordem alfabética
+        return sorted(resultado)[:limite]
+
+    def __buscar_prefixo_recursivo(self, no, prefixo, resultado):
+        # Função recursiva para buscar palavras por prefixo.
+        # Recebe o nó atual da recursão, o prefixo procurado e a lista a ser adicionado o resultado
+        if no is None:
+            return
+
+        # Verifica se a palavra atual começa com o prefixo
+        if no.palavra[:len(prefixo)] == prefixo:
+            resultado.append(no.palavra)
+
+        # Se o prefixo pode estar à esquerda, busca lá
+        if prefixo < no.palavra:
+            self.__buscar_prefixo_recursivo(no.esquerda, prefixo, resultado)
+
+        # Se o prefixo pode estar à direita, busca lá
+        if prefixo >= no.palavra[:len(prefixo)]:
+            self.__buscar_prefixo_recursivo(no.direita, prefixo, resultado)
+
+    def remover(self, palavra, linha=None):
+        # Remove uma palavra ou uma linha específica de uma palavra
+        # Recebe a palavra a ser removida e uma linha (opcional) a ser removida
+        # Retorna True se for bem sucedido, False se contrário
+
+        palavra = palavra.lower()
+        resultado = [False]
+        self.__raiz = self.__remover_recursivo(self.__raiz, palavra, linha, resultado)
+        return resultado[0]
+
+    def __remover_recursivo(self, no, palavra, linha, resultado):
+        # Função recursiva para remover um nó ou linha
+        # Recebe o nó atual da recursão, a paavra a ser removida, a linha (se não tiver, None) e o resultado(booleano)
+        if no is None:
+            return no
+
+        # Navega até encontrar a palavra
+        if palavra < no.palavra:
+            no.esquerda = self.__remover_recursivo(no.esquerda, palavra, linha, resultado)
+        elif palavra > no.palavra:
+            no.direita = self.__remover_recursivo(no.direita, palavra, linha, resultado)
+        else:
+            # Palavra encontrada
+            if linha is not None:
+                # Remove apenas a linha específica
+                encontrou, ficou_vazia = no.remover_linha(linha)
+                if not encontrou:
+                    return no  # linha não existia, não marca sucesso
+                if not ficou_vazia:
+                    resultado[0] = True
+                    self.__atualizar_altura(no)
+                    return no
+
+            # Se ficou vazia ou remoção total, continua para remover o nó
+            resultado[0] = True
+
+            # Caso 1: Nó sem filhos ou com apenas um filho
+            if no.esquerda is None:
+                return no.direita
+            elif no.direita is None:
+                return no.esquerda
+
+            # Caso 2: Nó com dois filhos
+            # Encontra o sucessor (menor valor da subárvore direita)
+            sucessor = self.__encontrar_minimo(no.direita)
+
+            # Copia os dados do sucessor para este nó
+            no.palavra = sucessor.palavra
+            # O sucessor sai da árvore logo em seguida, então o vetor de linhas pode ser reaproveitado
+            no.linhas = sucessor.linhas
+
+            # Remove o sucessor
+            no.direita = self.__remover_recursivo(no.direita, sucessor.palavra, None, resultado)
+
+        if no is None:
+            return no
+
+        # Atualiza altura e balanceia
+        self.__atualizar_altura(no)
+        balanceamento = self.__fator_balanceamento(no)
+
+        # Rebalanceia se necessário
+        # Caso Esquerda-Esquerda
+        if balanceamento > 1 and self.__fator_balanceamento(no.esquerda) >= 0:
+            self.total_rotacoes += 1
+            return self.__rotacao_LL(no)
+
+        # Caso Esquerda-Direita
+        if balanceamento > 1 and self.__fator_balanceamento(no.esquerda) < 0:
+            self.total_rotacoes += 1
+            return self.__rotacao_LR(no)
+
+        # Caso Direita-Direita
+        if balanceamento < -1 and self.__fator_balanceamento(no.direita) <= 0:
+            self.total_rotacoes += 1
+            return self.__rotacao_RR(no)
+
+        # Caso Direita-Esquerda
+        if balanceamento < -1 and self.__fator_balanceamento(no.direita) > 0:
+            self.total_rotacoes += 1
+            return self.__rotacao_RL(no)
+
+        return no
+
+    def __encontrar_minimo(self, no):
+        # Encontra o nó com menor valor em uma subárvore
+        atual = no
+        while atual.esquerda is not None:
+            atual = atual.esquerda
+        return atual
+
+    def imprimir_indice(self):
+        # Imprime o índice remissivo completo em ordem alfabética
+        # Retorna uma lista de string
+        resultado = []
+        self.__percorrer_em_ordem(self.__raiz, resultado)
+        return resultado
+
+    def __percorrer_em_ordem(self, no, resultado):
+        # Percorre a árvore no percurso "em-ordem"
+        # Recebe uma lista para armazenar o resultado
+        if no is not None:
+            self.__percorrer_em_ordem(no.esquerda, resultado)
+            resultado.append(str(no))
+            self.__percorrer_em_ordem(no.direita, resultado)
+
+    def contar_palavras_total(self):
+        # Conta o total de palavras no índice (inclui repetições em diferentes linhas)
+        # A raiz já guarda a soma das linhas de toda a árvore
+        return self.__ocorrencias(self.__raiz)
+
+    def contar_palavras_distintas(self):
+        # Conta o número de palavras distintas
+        # A raiz já guarda a quantidade de nós da árvore
+        return self.__tamanho(self.__raiz)
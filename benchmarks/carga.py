@@ -0,0 +1,94 @@
+# Gerador de carga para o servidor de consultas (servidor.py)
+# Abre várias conexões, manda pedidos com pipelining (até "janela" pedidos sem resposta por conexão)
+# e mede a vazão e a latência de cada pedido (do envio até a resposta)
+# Uso: python servidor.py &
+#      python -m benchmarks.carga --conexoes 16 --pedidos 20000 --janela 32
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+
+from benchmarks.escala import percentis
+from tokenizador import tokenizar
+
+# Mistura de pedidos: (operação, peso)
+MISTURA = (("buscar", 70), ("prefixo", 20), ("equilibrio", 5), ("mais_frequente", 5))
+
+
+def gerar_pedidos(quantidade, palavras, semente=0):
+    # Sorteia os pedidos de acordo com a mistura, usando palavras do próprio texto
+    gerador = random.Random(semente)
+    operacoes = gerador.choices([op for op, _ in MISTURA], weights=[peso for _, peso in MISTURA], k=quantidade)
+    pedidos = []
+    for operacao in operacoes:
+        palavra = gerador.choice(palavras)
+        if operacao == "prefixo":
+            pedidos.append({"op": "prefixo", "prefixo": palavra[:2], "limite": 20})
+        elif operacao == "mais_frequente":
+            pedidos.append({"op": "mais_frequente", "k": 20})
+        else:
+            pedidos.append({"op": operacao, "palavra": palavra})
+    return pedidos
+
+
+async def conexao(host, porta, pedidos, janela, latencias):
+    # Manda os pedidos de uma conexão mantendo no máximo "janela" sem resposta
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    enviados = deque()
+    livres = asyncio.Semaphore(janela)
+
+    async def receber():
+        for _ in pedidos:
+            linha = await leitor.readline()
+            if not linha:
+                raise ConnectionError("o servidor fechou a conexão")
+            latencias.append(time.perf_counter() - enviados.popleft())
+            livres.release()
+
+    recebedor = asyncio.create_task(receber())
+    for pedido in pedidos:
+        await livres.acquire()
+        enviados.append(time.perf_counter())
+        escritor.write(json.dumps(pedido, ensure_ascii=False).encode('utf-8') + b"\n")
+        await escritor.drain()
+    await recebedor
+
+    escritor.close()
+    await escritor.wait_closed()
+
+
+async def gerar_carga(host, porta, pedidos, conexoes, janela):
+    # Divide os pedidos entre as conexões e retorna (tempo total, lista de latências)
+    latencias = []
+    fatias = [pedidos[i::conexoes] for i in range(conexoes)]
+    inicio = time.perf_counter()
+    await asyncio.gather(*(conexao(host, porta, fatia, janela, latencias) for fatia in fatias))
+    return time.perf_counter() - inicio, latencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera carga no servidor de consultas e mede vazão e latência.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--arquivo", default="ContoDeEscola.txt", help="texto de onde vêm as palavras consultadas")
+    parser.add_argument("--conexoes", type=int, default=8)
+    parser.add_argument("--pedidos", type=int, default=10_000, help="total de pedidos, somando todas as conexões")
+    parser.add_argument("--janela", type=int, default=16, help="pedidos sem resposta permitidos por conexão")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.arquivo, 'r', encoding='utf-8') as arquivo:
+        palavras = sorted({palavra for palavra, _ in tokenizar(arquivo)})
+    pedidos = gerar_pedidos(args.pedidos, palavras, args.semente)
+
+    tempo, latencias = asyncio.run(gerar_carga(args.host, args.porta, pedidos, args.conexoes, args.janela))
+    resumo = percentis(latencias)
+    print(f"{len(latencias)} pedidos em {tempo:.3f}s ({len(latencias) / tempo:.0f} pedidos/s) | "
+          f"p50: {resumo['p50_us']:.0f} us | p99: {resumo['p99_us']:.0f} us | máx: {resumo['max_us']:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Geradores de corpora sintéticos para os benchmarks
+# Cada cenário produz a lista de pares (palavra, linha) que a árvore recebe na construção do índice
+
+import random
+
+# Letras usadas nas palavras sintéticas (inclui acentuadas, como no texto real)
+LETRAS = "abcdefghijklmnopqrstuvwxyzáéíóúãõç"
+
+
+def gerar_vocabulario(quantidade, semente=0):
+    # Gera uma lista de palavras aleatórias distintas com 2 a 12 letras
+    gerador = random.Random(semente)
+    vocabulario = set()
+    while len(vocabulario) < quantidade:
+        tamanho = gerador.randint(2, 12)
+        vocabulario.add("".join(gerador.choice(LETRAS) for _ in range(tamanho)))
+    return sorted(vocabulario)
+
+
+def gerar_tokens(total, vocabulario, palavras_por_linha=12, semente=0):
+    # Gera a lista de pares (palavra, linha) com frequências seguindo a lei de Zipf
+    # A palavra de posição i no ranking aparece com peso 1 / (i + 1)
+    gerador = random.Random(semente)
+    ordem = vocabulario[:]
+    gerador.shuffle(ordem)
+    pesos = [1 / (i + 1) for i in range(len(ordem))]
+    palavras = gerador.choices(ordem, weights=pesos, k=total)
+    return [(palavra, i // palavras_por_linha + 1) for i, palavra in enumerate(palavras)]
+
+
+def palavras_em_ordem(quantidade):
+    # Gera "quantidade" palavras distintas já em ordem alfabética, sem sorteio
+    # Cada palavra é o número i escrito na base das letras, com largura fixa, então a ordem numérica
+    # é a mesma ordem alfabética (e gerar 10^7 palavras não exige ordenar nada)
+    letras_ordenadas = sorted(LETRAS)  # na ordem das strings do Python, as acentuadas vêm depois do "z"
+    base = len(letras_ordenadas)
+    largura = 1
+    while base ** largura < quantidade:
+        largura += 1
+
+    palavras = []
+    for i in range(quantidade):
+        letras = []
+        for _ in range(largura):
+            i, resto = divmod(i, base)
+            letras.append(letras_ordenadas[resto])
+        palavras.append("".join(reversed(letras)))
+    return palavras
+
+
+def gerar_corpus(cenario, total, vocabulario=50_000, palavras_por_linha=12, semente=0):
+    # Gera o corpus de um cenário com "total" tokens
+    #   "zipf": vocabulário aleatório com frequências de Zipf (parecido com texto real)
+    #   "ordenado": todas as palavras distintas e em ordem alfabética (pior caso de rotações)
+    #   "inverso": todas as palavras distintas e em ordem alfabética decrescente
+    if cenario == "zipf":
+        palavras = gerar_vocabulario(min(vocabulario, total), semente)
+        return gerar_tokens(total, palavras, palavras_por_linha, semente)
+
+    if cenario in ("ordenado", "inverso"):
+        palavras = palavras_em_ordem(total)
+        if cenario == "inverso":
+            palavras.reverse()
+        return [(palavra, i // palavras_por_linha + 1) for i, palavra in enumerate(palavras)]
+
+    raise ValueError(f"Cenário desconhecido: {cenario}")
+
+
+CENARIOS = ("zipf", "ordenado", "inverso")
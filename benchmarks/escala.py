@@ -0,0 +1,186 @@
+# Relatório de escala dos motores do índice em corpora sintéticos
+# Para cada cenário e tamanho mede a vazão da construção, de buscar e de remover, as latências (percentis)
+# de buscar, buscar_por_prefixo e remover, o pico de memória (tracemalloc) e o total de rotações
+# Com vários motores, todos são medidos com os mesmos tokens e as mesmas consultas (comparação direta)
+# O resultado é gravado em JSON para comparar versões do motor ao longo do tempo
+# Uso: python -m benchmarks.escala --tokens 1000 10000 100000 --saida escala.json
+#      python -m benchmarks.escala --motor avl vetor --cenarios zipf ordenado
+#      python -m benchmarks.escala --motor avl:ArvoreAVL
+#      python -m benchmarks.escala --cenarios zipf --modos avl --tokens 1000000 --sem-memoria \
+#          --motor avl benchmarks.avl_recursiva:ArvoreAVLRecursiva
+
+import argparse
+import importlib
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.corpus import CENARIOS, gerar_corpus
+from main import MOTORES
+
+MODOS = ("avl", "bulk")
+
+
+def carregar_motor(especificacao):
+    # Retorna a classe do motor pelo nome em main.MOTORES ("avl", "vetor")
+    # ou a importa a partir de "modulo:Classe" (por exemplo "avl:ArvoreAVL")
+    if especificacao in MOTORES:
+        return MOTORES[especificacao]
+    modulo, _, classe = especificacao.partition(":")
+    return getattr(importlib.import_module(modulo), classe or "ArvoreAVL")
+
+
+def construir(motor, tokens, modo):
+    # Constrói a árvore do mesmo jeito que construir_indice (main.py)
+    # "avl" insere token por token; "bulk" junta as linhas num dicionário e monta a árvore de uma vez
+    if modo == "avl":
+        arvore = motor()
+        for palavra, linha in tokens:
+            arvore.inserir(palavra, linha)
+        return arvore
+
+    postagens = {}
+    for palavra, linha in tokens:
+        linhas = postagens.get(palavra)
+        if linhas is None:
+            postagens[palavra] = [linha]
+        elif linhas[-1] != linha:
+            linhas.append(linha)
+    return motor.from_postings(postagens)
+
+
+def percentis(amostras):
+    # Resume uma lista de latências (em segundos) nos percentis 50, 90 e 99 e no máximo, em microssegundos
+    if not amostras:
+        return {}
+    ordenadas = sorted(amostras)
+    ultimo = len(ordenadas) - 1
+
+    def percentil(p):
+        return ordenadas[min(ultimo, int(p / 100 * len(ordenadas)))] * 1e6
+
+    return {"p50_us": percentil(50), "p90_us": percentil(90), "p99_us": percentil(99), "max_us": ordenadas[-1] * 1e6}
+
+
+def vazao(duracoes):
+    # Operações por segundo, somando as durações medidas uma a uma
+    total = sum(duracoes)
+    return len(duracoes) / total if total else None
+
+
+def medir_latencias(operacao, argumentos):
+    # Chama a operação uma vez para cada argumento e retorna a lista de durações
+    relogio = time.perf_counter
+    duracoes = []
+    for argumento in argumentos:
+        inicio = relogio()
+        operacao(*argumento)
+        duracoes.append(relogio() - inicio)
+    return duracoes
+
+
+def medir_pico_memoria(motor, tokens, modo):
+    # Constrói a árvore de novo com o tracemalloc ligado e retorna o pico de memória em bytes
+    # É uma construção separada porque o tracemalloc deixa a alocação bem mais lenta e distorceria o tempo
+    tracemalloc.start()
+    try:
+        arvore = construir(motor, tokens, modo)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del arvore
+    return pico
+
+
+def medir(motor, tokens, modo, consultas, limite_prefixo, semente=0, memoria=True):
+    # Mede um cenário: construção, consultas e remoções
+    # Retorna um dicionário pronto para ser gravado no JSON
+    inicio = time.perf_counter()
+    arvore = construir(motor, tokens, modo)
+    tempo_construcao = time.perf_counter() - inicio
+
+    gerador = random.Random(semente)
+    palavras = sorted({palavra for palavra, _ in tokens})
+    amostra = gerador.choices(palavras, k=consultas)
+
+    buscas = medir_latencias(arvore.buscar, [(palavra,) for palavra in amostra])
+    prefixos = medir_latencias(
+        arvore.buscar_por_prefixo,
+        [(palavra[:gerador.randint(1, len(palavra))], limite_prefixo) for palavra in amostra],
+    )
+    resultado = {
+        "modo": modo,
+        "tokens": len(tokens),
+        "distintas": arvore.contar_palavras_distintas(),
+        "tempo_construcao_s": tempo_construcao,
+        "tokens_por_segundo": len(tokens) / tempo_construcao if tempo_construcao else None,
+        "rotacoes_construcao": arvore.total_rotacoes,
+        "buscas_por_segundo": vazao(buscas),
+        "buscar": percentis(buscas),
+        "buscar_por_prefixo": percentis(prefixos),
+    }
+
+    # As remoções vêm por último porque esvaziam a árvore
+    removidas = gerador.sample(palavras, min(consultas, len(palavras)))
+    remocoes = medir_latencias(arvore.remover, [(palavra,) for palavra in removidas])
+    resultado["remocoes_por_segundo"] = vazao(remocoes)
+    resultado["remover"] = percentis(remocoes)
+    resultado["rotacoes_remocao"] = arvore.total_rotacoes - resultado["rotacoes_construcao"]
+
+    if memoria:
+        resultado["pico_memoria_bytes"] = medir_pico_memoria(motor, tokens, modo)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede como os motores do índice escalam em corpora sintéticos e grava o resultado em JSON.")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[10**3, 10**4, 10**5], help="tamanhos dos corpora (até 10^7)")
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS, default=list(CENARIOS))
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=list(MODOS))
+    parser.add_argument("--motor", nargs="+", default=["avl"],
+                        help=f"motores comparados: {', '.join(MOTORES)} ou uma classe no formato modulo:Classe")
+    parser.add_argument("--vocabulario", type=int, default=50_000, help="palavras distintas do cenário zipf")
+    parser.add_argument("--consultas", type=int, default=10_000, help="quantidade de buscas, buscas por prefixo e remoções")
+    parser.add_argument("--limite-prefixo", type=int, default=20, help="máximo de palavras por busca de prefixo")
+    parser.add_argument("--sem-memoria", action="store_true", help="não mede o pico de memória (evita a construção extra)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", default="escala.json", help="arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    motores = {especificacao: carregar_motor(especificacao) for especificacao in args.motor}
+    relatorio = {
+        "motores": args.motor,
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "semente": args.semente,
+        "resultados": [],
+    }
+
+    for cenario in args.cenarios:
+        for total in args.tokens:
+            tokens = gerar_corpus(cenario, total, args.vocabulario, semente=args.semente)
+            for modo in args.modos:
+                for especificacao, motor in motores.items():
+                    resultado = medir(motor, tokens, modo, args.consultas, args.limite_prefixo,
+                                      args.semente, not args.sem_memoria)
+                    resultado["cenario"] = cenario
+                    resultado["motor"] = especificacao
+                    relatorio["resultados"].append(resultado)
+                    print(f"{especificacao:>6} | {cenario:>9} | {modo:>4} | {total:>9} tokens | "
+                          f"{resultado['tokens_por_segundo']:>10.0f} tokens/s | "
+                          f"buscar: {resultado['buscas_por_segundo'] or 0:>10.0f} ops/s | "
+                          f"remover: {resultado['remocoes_por_segundo'] or 0:>10.0f} ops/s | "
+                          f"buscar p99: {resultado['buscar'].get('p99_us', 0):>7.1f} us | "
+                          f"rotações: {resultado['rotacoes_construcao']}")
+
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
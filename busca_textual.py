@@ -0,0 +1,66 @@
+# Módulo com o índice secundário para busca por sufixo e por trecho (infixo)
+# Guarda as palavras do vocabulário de duas formas, além da árvore principal:
+#  - invertidas, numa ArvoreAVL: as palavras que terminam com um sufixo são as palavras invertidas que
+#    começam com o sufixo invertido, então a busca é uma varredura por prefixo, O(log n + k)
+#  - por trigramas: cada palavra, com as marcas de início "^" e de fim "$", é dividida em trechos de 3 letras;
+#    as palavras que contêm um trecho são procuradas só entre as que têm todos os trigramas dele
+
+from avl import ArvoreAVL
+
+
+def _trigramas(palavra):
+    # Trigramas da palavra com as marcas de início e fim (a palavra "e" vira "^e$")
+    marcada = f"^{palavra}$"
+    return {marcada[i:i + 3] for i in range(len(marcada) - 2)}
+
+
+class IndiceTextual:
+    # Índice secundário do vocabulário de uma ArvoreAVL (ver ArvoreAVL.buscar_por_sufixo e buscar_por_trecho)
+
+    def __init__(self, palavras=()):
+        # A árvore das palavras invertidas só usa a ordem das chaves; a linha 0 apenas ocupa o lugar das linhas
+        self.__invertidas = ArvoreAVL()
+        self.__trigramas = {}  # trigrama -> conjunto de palavras
+        for palavra in palavras:
+            self.adicionar(palavra)
+
+    def adicionar(self, palavra):
+        # Registra uma palavra nova do vocabulário
+        self.__invertidas.inserir(palavra[::-1], 0)
+        for trigrama in _trigramas(palavra):
+            conjunto = self.__trigramas.get(trigrama)
+            if conjunto is None:
+                self.__trigramas[trigrama] = {palavra}
+            else:
+                conjunto.add(palavra)
+
+    def remover(self, palavra):
+        # Retira uma palavra que saiu do vocabulário
+        self.__invertidas.remover(palavra[::-1])
+        for trigrama in _trigramas(palavra):
+            conjunto = self.__trigramas[trigrama]
+            conjunto.discard(palavra)
+            if not conjunto:
+                del self.__trigramas[trigrama]
+
+    def terminadas_em(self, sufixo, limite=None):
+        # Retorna as palavras que terminam com o sufixo, na ordem das palavras invertidas
+        # (palavras com o mesmo final ficam juntas: "somente", "simplesmente", "realmente"...)
+        return [invertida[::-1] for invertida in self.__invertidas.percorrer_prefixo(sufixo[::-1], limite)]
+
+    def contendo(self, trecho, limite=None):
+        # Retorna, em ordem alfabética, as palavras que contêm o trecho
+        if len(trecho) >= 3:
+            # Candidatas: palavras que têm todos os trigramas do trecho, começando pelo conjunto menor
+            conjuntos = sorted((self.__trigramas.get(trecho[i:i + 3], set()) for i in range(len(trecho) - 2)), key=len)
+            candidatas = conjuntos[0].intersection(*conjuntos[1:])
+        else:
+            # Trecho curto: junta as palavras dos trigramas que contêm o trecho (as marcas garantem que
+            # até palavras de 1 ou 2 letras têm um trigrama)
+            candidatas = set()
+            for trigrama, conjunto in self.__trigramas.items():
+                if trecho in trigrama:
+                    candidatas.update(conjunto)
+
+        resultado = sorted(palavra for palavra in candidatas if trecho in palavra)
+        return resultado if limite is None else resultado[:max(limite, 0)]
@@ -0,0 +1,117 @@
+# Módulo com as consultas booleanas (E / OU / NÃO) sobre as linhas das palavras
+# As listas de linhas de cada nó já estão em ordem crescente, então as operações caminham pelas listas
+# sem montar conjuntos. A interseção é guiada pela lista menor e procura os valores nas outras com busca
+# exponencial ("galope"): uma palavra muito frequente combinada com uma rara custa proporcional à rara.
+# Todas as funções são geradores que produzem os números das linhas em ordem crescente.
+
+import heapq
+from bisect import bisect_left
+
+
+def _galopar(lista, alvo, inicio):
+    # Retorna a primeira posição >= inicio com lista[posição] >= alvo
+    # Dá saltos de 1, 2, 4, 8... a partir de inicio e termina com busca binária no último salto,
+    # então o custo é O(log d), sendo d a distância até a posição encontrada
+    tamanho = len(lista)
+    fim = inicio
+    passo = 1
+    while fim < tamanho and lista[fim] < alvo:
+        inicio = fim + 1
+        fim += passo
+        passo *= 2
+    return bisect_left(lista, alvo, inicio, min(fim, tamanho))
+
+
+def interseccao(listas):
+    # Linhas presentes em todas as listas
+    # A lista menor guia a busca; quando outra lista não tem o valor, o próximo candidato é o valor
+    # encontrado nela, e a lista menor avança até ele também com galope
+    listas = sorted(listas, key=len)
+    if not listas:
+        return
+    base, outras = listas[0], listas[1:]
+    cursores = [0] * len(outras)
+
+    i = 0
+    while i < len(base):
+        alvo = base[i]
+        for j, outra in enumerate(outras):
+            posicao = _galopar(outra, alvo, cursores[j])
+            cursores[j] = posicao
+            if posicao == len(outra):
+                return
+            if outra[posicao] != alvo:
+                alvo = outra[posicao]
+                break
+        else:
+            yield alvo
+            i += 1
+            continue
+        i = _galopar(base, alvo, i + 1)
+
+
+def uniao(listas):
+    # Linhas presentes em pelo menos uma das listas, sem repetição
+    anterior = None
+    for linha in heapq.merge(*listas):
+        if linha != anterior:
+            yield linha
+            anterior = linha
+
+
+def diferenca(linhas, excluidas):
+    # Linhas do iterável (em ordem crescente) que não aparecem em nenhuma das listas excluídas
+    cursores = [0] * len(excluidas)
+    for linha in linhas:
+        for j, lista in enumerate(excluidas):
+            posicao = _galopar(lista, linha, cursores[j])
+            cursores[j] = posicao
+            if posicao < len(lista) and lista[posicao] == linha:
+                break
+        else:
+            yield linha
+
+
+def _filtrar_alguma(linhas, listas):
+    # Linhas do iterável que aparecem em pelo menos uma das listas
+    cursores = [0] * len(listas)
+    for linha in linhas:
+        for j, lista in enumerate(listas):
+            posicao = _galopar(lista, linha, cursores[j])
+            cursores[j] = posicao
+            if posicao < len(lista) and lista[posicao] == linha:
+                yield linha
+                break
+
+
+def consultar(indice, todas=(), alguma=(), nenhuma=()):
+    # Gerador com as linhas que têm todas as palavras de "todas" (E), pelo menos uma de "alguma" (OU)
+    # e nenhuma de "nenhuma" (NÃO), em ordem crescente
+    # O índice pode ser uma ArvoreAVL, um IndiceMapeado ou um Instantaneo (qualquer objeto com buscar)
+    # Exemplos: consultar(arvore, todas=["escola", "mestre"])
+    #           consultar(arvore, todas=["pilar"], nenhuma=["raimundo"])
+    if not todas and not alguma:
+        raise ValueError("A consulta precisa de pelo menos uma palavra em 'todas' ou em 'alguma'")
+
+    def linhas_de(palavras):
+        # Listas de linhas das palavras que existem no índice (None no lugar das que não existem)
+        return [no.linhas if no else None for no in map(indice.buscar, palavras)]
+
+    listas_todas = linhas_de(todas)
+    if None in listas_todas:
+        return
+    listas_alguma = [linhas for linhas in linhas_de(alguma) if linhas is not None]
+    if alguma and not listas_alguma:
+        return
+    listas_nenhuma = [linhas for linhas in linhas_de(nenhuma) if linhas is not None]
+
+    if listas_todas:
+        linhas = interseccao(listas_todas)
+        if listas_alguma:
+            linhas = _filtrar_alguma(linhas, sorted(listas_alguma, key=len, reverse=True))
+    else:
+        linhas = uniao(listas_alguma)
+
+    if listas_nenhuma:
+        linhas = diferenca(linhas, listas_nenhuma)
+    yield from linhas
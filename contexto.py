@@ -0,0 +1,105 @@
+# Módulo com a palavra no contexto (KWIC, "keyword in context")
+# Para mostrar o trecho do texto onde a palavra aparece, o arquivo fonte é mapeado com mmap e cada linha
+# é recortada direto do mapa, usando uma tabela com a posição (em bytes) do início de cada linha.
+# Com a tabela, ler qualquer linha é um acesso O(1), sem reler o arquivo, e só as páginas das linhas
+# lidas vão para a memória, então o arquivo pode ser maior que a RAM.
+
+import mmap
+import os
+import re
+from array import array
+
+from tokenizador import tokenizar_linha
+
+# As mesmas quebras de linha do modo texto do Python: "\r\n", "\r" sozinho e "\n"
+_QUEBRA = re.compile(rb"\r\n|\r|\n")
+
+# Trechos sem espaço em branco; cada um vira no máximo uma palavra no tokenizador
+_TRECHO = re.compile(r"\S+")
+
+
+def mapear_linhas(caminho_arquivo):
+    # Retorna um vetor com a posição em bytes do início de cada linha do arquivo, mais o tamanho do arquivo
+    # no final: a linha n (contando de 1) ocupa os bytes [inicios[n - 1], inicios[n]), com a quebra de linha
+    # A numeração é a mesma do tokenizador; uma última linha vazia depois da quebra final não conta
+    inicios = array('Q', (0,))
+    tamanho = os.path.getsize(caminho_arquivo)
+    if tamanho == 0:
+        return inicios
+
+    with open(caminho_arquivo, 'rb') as arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        inicios.extend(quebra.end() for quebra in _QUEBRA.finditer(mapa))
+    if inicios[-1] != tamanho:
+        inicios.append(tamanho)
+    return inicios
+
+
+class FonteMapeada:
+    # Arquivo fonte do índice mapeado em memória, para ler as linhas pelo número
+
+    def __init__(self, caminho_arquivo, inicios=None):
+        # Recebe o arquivo e, de preferência, a tabela de inícios das linhas guardada com o índice
+        # (ArvoreAVL.inicios_linhas ou IndiceMapeado.inicios_linhas); sem ela, a tabela é montada agora
+        # Lança ValueError se a tabela não corresponder ao tamanho do arquivo
+        if inicios is None:
+            inicios = mapear_linhas(caminho_arquivo)
+        self.inicios = inicios
+        self.__mapa = None
+
+        tamanho = os.path.getsize(caminho_arquivo)
+        if inicios[len(inicios) - 1] != tamanho:
+            raise ValueError(f"A tabela de linhas não corresponde ao arquivo: {caminho_arquivo}")
+        if tamanho > 0:
+            with open(caminho_arquivo, 'rb') as arquivo:
+                self.__mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def fechar(self):
+        if self.__mapa is not None:
+            self.__mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def contar_linhas(self):
+        return len(self.inicios) - 1
+
+    def linha(self, numero):
+        # Retorna o texto da linha (contando de 1), sem a quebra de linha
+        # Lança IndexError se a linha não existir
+        if not 1 <= numero < len(self.inicios):
+            raise IndexError(f"Linha inexistente: {numero}")
+        trecho = self.__mapa[self.inicios[numero - 1]:self.inicios[numero]]
+        return trecho.rstrip(b"\r\n").decode('utf-8')
+
+    def contextos(self, indice, palavra, largura=40, limite=None):
+        # Gerador com as ocorrências da palavra no texto, na ordem do texto
+        # Cada ocorrência é a tupla (linha, texto à esquerda, palavra como está no texto, texto à direita),
+        # com até "largura" caracteres de cada lado, sem passar da própria linha
+        # O índice pode ser uma ArvoreAVL ou um IndiceMapeado (qualquer objeto com buscar)
+        palavra = palavra.lower()
+        no = indice.buscar(palavra)
+        if not no or (limite is not None and limite <= 0):
+            return
+
+        encontradas = 0
+        for numero in no.linhas:
+            texto = self.linha(numero)
+            # A palavra é procurada trecho a trecho com o mesmo tokenizador da construção,
+            # então "Escola," e "escola" são a mesma palavra
+            for trecho in _TRECHO.finditer(texto):
+                if tokenizar_linha(trecho.group()) != [palavra]:
+                    continue
+                inicio, fim = trecho.span()
+                yield numero, texto[max(inicio - largura, 0):inicio], trecho.group(), texto[fim:fim + largura]
+
+                encontradas += 1
+                if encontradas == limite:
+                    return
+
+    def formatar_contextos(self, indice, palavra, largura=40, limite=None):
+        # Retorna as ocorrências como linhas de texto alinhadas pela palavra, prontas para imprimir
+        return [f"{numero:>6}  {esquerda.rstrip():>{largura}} [{termo}] {direita.lstrip()}"
+                for numero, esquerda, termo, direita in self.contextos(indice, palavra, largura, limite)]
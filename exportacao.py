@@ -0,0 +1,73 @@
+# Módulo com a exportação do índice remissivo para arquivo
+# Os nós são lidos um a um do iterador em-ordem e as linhas de saída são juntadas em blocos grandes
+# antes de cada escrita, então a memória usada não depende do tamanho do índice.
+
+import csv
+import io
+import json
+
+FORMATOS = ("texto", "csv", "jsonl")
+
+# Quantidade aproximada de caracteres juntados antes de cada escrita no arquivo
+TAMANHO_BLOCO = 1 << 20
+
+
+def _linha_texto(no):
+    # Formato do índice remissivo: "palavra 1,2,3"
+    return str(no) + "\n"
+
+
+def _linha_jsonl(no):
+    # Um objeto JSON por linha: {"palavra": ..., "linhas": [...]}
+    return json.dumps({"palavra": no.palavra, "linhas": no.linhas.tolist()}, ensure_ascii=False) + "\n"
+
+
+def _escrever_em_blocos(arquivo, linhas, tamanho_bloco):
+    # Junta as strings recebidas e escreve no arquivo sempre que o bloco passa de tamanho_bloco caracteres
+    bloco = []
+    tamanho = 0
+    for linha in linhas:
+        bloco.append(linha)
+        tamanho += len(linha)
+        if tamanho >= tamanho_bloco:
+            arquivo.write("".join(bloco))
+            bloco.clear()
+            tamanho = 0
+    if bloco:
+        arquivo.write("".join(bloco))
+
+
+def _escrever_csv(arquivo, indice, tamanho_bloco):
+    # CSV com cabeçalho "palavra,linhas"; as linhas ficam separadas por espaço na segunda coluna
+    # O csv.writer escreve num buffer em memória que é descarregado no arquivo a cada bloco
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\n")
+    escritor.writerow(("palavra", "linhas"))
+    for no in indice:
+        escritor.writerow((no.palavra, " ".join(map(str, no.linhas))))
+        if buffer.tell() >= tamanho_bloco:
+            arquivo.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+    arquivo.write(buffer.getvalue())
+
+
+def exportar_indice(indice, destino, formato="texto", tamanho_bloco=TAMANHO_BLOCO):
+    # Escreve as entradas do índice em ordem alfabética no destino
+    # Recebe uma ArvoreAVL ou um IndiceMapeado, e um caminho ou um arquivo de texto já aberto
+    # O formato pode ser "texto" (igual ao indice_remissivo.txt), "csv" ou "jsonl"
+    # Quando recebe um arquivo aberto, não o fecha
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+
+    if not hasattr(destino, "write"):
+        # O módulo csv cuida das quebras de linha sozinho, por isso o arquivo é aberto com newline=""
+        with open(destino, "w", encoding="utf-8", newline="" if formato == "csv" else None) as arquivo:
+            exportar_indice(indice, arquivo, formato, tamanho_bloco)
+        return
+
+    if formato == "csv":
+        _escrever_csv(destino, indice, tamanho_bloco)
+    else:
+        linha = _linha_texto if formato == "texto" else _linha_jsonl
+        _escrever_em_blocos(destino, map(linha, indice), tamanho_bloco)
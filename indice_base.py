@@ -0,0 +1,190 @@
+# Módulo com a interface comum dos motores do índice remissivo
+# Um motor guarda as palavras com as linhas onde elas aparecem e oferece as operações usadas por
+# construir_indice, pelo menu, pela exportação e pelo índice binário. A ArvoreAVL (avl.py) e o
+# IndiceVetorOrdenado (vetor_ordenado.py) são as duas implementações; main.MOTORES lista os dois.
+
+import heapq
+from abc import ABC, abstractmethod
+from itertools import islice
+
+# ME das palavras de um motor que não é uma árvore (como o IndiceVetorOrdenado): a palavra existe, mas não
+# há nó com subárvores para comparar. medidor_equilibrio continua retornando None para palavras ausentes
+ME_NAO_APLICAVEL = "não se aplica"
+
+
+class Frequencias:
+    # Palavras agrupadas pela quantidade de linhas: {quantidade: {palavra: None}}
+    # Cada grupo é um dicionário usado como conjunto ordenado (na ordem em que as palavras chegaram)
+    # Os motores avisam cada mudança na quantidade de linhas de uma palavra, e a palavra mais frequente
+    # sai em O(1), sem percorrer o índice
+
+    def __init__(self):
+        self.grupos = {}
+        self.maior = 0  # Maior quantidade de linhas entre as palavras do índice
+
+    def mudar(self, palavra, antiga, nova):
+        # Move a palavra do grupo "antiga" para o grupo "nova" (0 quer dizer fora do índice)
+        # Mantém a maior quantidade atualizada sem percorrer o índice
+        if antiga:
+            grupo = self.grupos[antiga]
+            del grupo[palavra]
+            if not grupo:
+                del self.grupos[antiga]
+        if nova:
+            self.grupos.setdefault(nova, {})[palavra] = None
+            if nova > self.maior:
+                self.maior = nova
+
+        if antiga == self.maior and antiga not in self.grupos:
+            # O grupo da maior quantidade esvaziou: se a palavra só perdeu uma linha, ela é a nova maior;
+            # se saiu do índice, procura a maior quantidade entre os grupos restantes
+            self.maior = nova if nova else max(self.grupos, default=0)
+
+    def mais_frequente(self):
+        # Retorna [palavra, número de linhas], ou a tupla (None, 0) se o índice estiver vazio
+        # No empate vale a palavra que chegou primeiro ao grupo
+        if not self.maior:
+            return None, 0
+        return [next(iter(self.grupos[self.maior])), self.maior]
+
+    def mais_frequentes(self, k):
+        # Retorna as k palavras que aparecem em mais linhas, como uma lista de pares (palavra, número de linhas)
+        # Só as k maiores quantidades são consultadas, e cada grupo é lido até completar as k palavras
+        resultado = []
+        for quantidade in heapq.nlargest(k, self.grupos):
+            for palavra in islice(self.grupos[quantidade], k - len(resultado)):
+                resultado.append((palavra, quantidade))
+            if len(resultado) == k:
+                break
+        return resultado
+
+    def reordenar(self, ranking):
+        # Refaz os grupos na ordem de ranking, uma lista de pares (palavra, número de linhas) com todas as
+        # palavras do índice (como a de mais_frequentes): nos empates passa a valer a ordem da lista
+        self.grupos = {}
+        for palavra, quantidade in ranking:
+            self.grupos.setdefault(quantidade, {})[palavra] = None
+        self.maior = max(self.grupos, default=0)
+
+
+class IndiceRemissivo(ABC):
+    # Interface dos motores do índice remissivo
+    # Além dos métodos, todo motor tem os atributos total_rotacoes, palavras_descartadas (palavras
+    # repetidas) e inicios_linhas (ver contexto.py), preenchidos como na ArvoreAVL
+    # buscar retorna um nó (no.py) com a palavra e o vetor de linhas em ordem crescente, ou False
+
+    nome = "índice remissivo"  # nome da estrutura nas estatísticas do indice_remissivo.txt
+
+    @classmethod
+    @abstractmethod
+    def from_sorted(cls, pares):
+        # Constrói o índice a partir de pares (palavra, linhas) em ordem alfabética e sem palavras repetidas
+        ...
+
+    @classmethod
+    def from_postings(cls, postagens):
+        # Constrói o índice a partir de um dicionário {palavra: linhas}
+        # Ordena as palavras distintas uma única vez e monta o índice de uma vez
+        return cls.from_sorted((palavra, postagens[palavra]) for palavra in sorted(postagens))
+
+    @abstractmethod
+    def inserir(self, palavra, linha):
+        # Insere uma palavra e sua linha no índice
+        ...
+
+    @abstractmethod
+    def remover(self, palavra, linha=None):
+        # Remove uma palavra ou uma linha específica de uma palavra
+        # Retorna True se for bem sucedido, False se contrário
+        ...
+
+    @abstractmethod
+    def buscar(self, palavra):
+        # Retorna o nó da palavra caso encontre e False caso contrário
+        ...
+
+    def buscar_muitos(self, palavras):
+        # Busca várias palavras de uma vez
+        # Retorna um dicionário {palavra: nó encontrado ou False}, com as palavras do jeito que foram recebidas
+        return {palavra: self.buscar(palavra) for palavra in palavras}
+
+    @abstractmethod
+    def percorrer_prefixo(self, prefixo, limite=None):
+        # Gerador que produz, em ordem alfabética, as palavras que começam com o prefixo
+        ...
+
+    def buscar_por_prefixo(self, prefixo, limite=None):
+        # Busca todas as palavras que começam com um determinado prefixo.
+        # Recebe o prefixo a ser procurado e, opcionalmente, o número máximo de palavras
+        # Retorna a lista de palavras em ordem alfabética
+        return list(self.percorrer_prefixo(prefixo, limite))
+
+    @abstractmethod
+    def medidor_equilibrio(self, palavra):
+        # Retorna o Medidor de Equilíbrio (ME) da palavra, ou None se ela não estiver no índice
+        # Motores sem nós com subárvores retornam ME_NAO_APLICAVEL para as palavras do índice
+        ...
+
+    def medidores_em_ordem(self):
+        # Gerador com o ME de cada palavra, em ordem alfabética (na mesma ordem de nos_em_ordem)
+        # Usado para gravar o ME da estrutura construída no índice binário (ver persistencia.py)
+        for no in self.nos_em_ordem():
+            yield self.medidor_equilibrio(no.palavra)
+
+    def buscar_com_medidor_equilibrio(self, palavra):
+        # Busca uma palavra e retorna um medidor de equilibrio
+        # Recebe a palavra a ser buscada
+        # Retorna -1 se a palavra não existe, 0 se o nó está equilibrado, 1 se não está
+        # e 2 se a palavra existe mas o motor não tem ME (ME_NAO_APLICAVEL)
+        me = self.medidor_equilibrio(palavra)
+        if me is None:
+            return -1
+        if me == ME_NAO_APLICAVEL:
+            return 2
+
+        if me == 0:
+            return 0
+        else:
+            print(f"Medidor de Equilíbrio (ME) para '{palavra}': {me}")
+            return 1
+
+    @abstractmethod
+    def palavra_mais_frequente(self):
+        # Retorna [palavra, número de linhas], ou a tupla (None, 0) se o índice estiver vazio
+        ...
+
+    @abstractmethod
+    def mais_frequentes(self, k):
+        # Retorna as k palavras que aparecem em mais linhas, como uma lista de pares (palavra, número de linhas)
+        ...
+
+    @abstractmethod
+    def reordenar_frequencias(self, ranking):
+        # Troca a ordem de desempate das palavras com o mesmo número de linhas pela ordem de ranking
+        # (pares (palavra, número de linhas) de todas as palavras, como os de mais_frequentes)
+        # Usado por IndiceMapeado.para_arvore para manter os empates do índice gravado
+        ...
+
+    @abstractmethod
+    def nos_em_ordem(self):
+        # Gerador que produz os nós em ordem alfabética
+        ...
+
+    def __iter__(self):
+        # Percorrer o índice com "for no in indice" produz os nós em ordem alfabética, sem montar nenhuma lista
+        return self.nos_em_ordem()
+
+    def imprimir_indice(self):
+        # Imprime o índice remissivo completo em ordem alfabética
+        # Retorna uma lista de string
+        return [str(no) for no in self.nos_em_ordem()]
+
+    @abstractmethod
+    def contar_palavras_total(self):
+        # Conta o total de palavras no índice (inclui repetições em diferentes linhas)
+        ...
+
+    @abstractmethod
+    def contar_palavras_distintas(self):
+        # Conta o número de palavras distintas
+        ...
@@ -0,0 +1,155 @@
+# Módulo com o índice remissivo de vários documentos (corpus)
+# O vocabulário é uma única ArvoreAVL compartilhada por todos os documentos, em que as "linhas" de cada
+# palavra são os números (ids) dos documentos onde ela aparece. As linhas de cada palavra ficam agrupadas
+# por documento: cada documento tem a sua própria tabela compacta (palavras em ordem alfabética, offsets e
+# um único vetor de linhas), então uma consulta restrita a um documento só lê a tabela daquele documento.
+
+import os
+from array import array
+from bisect import bisect_left
+
+from avl import ArvoreAVL
+from tokenizador import tokenizar
+
+
+class TabelaDocumento:
+    # Postagens de um documento: palavras em ordem alfabética e as linhas de cada uma num vetor único
+    # As linhas da palavra i ficam em linhas[inicios[i]:inicios[i + 1]]
+
+    __slots__ = ("nome", "palavras", "inicios", "linhas", "total_palavras")
+
+    def __init__(self, nome, postagens, total_palavras):
+        # Recebe o dicionário {palavra: linhas} montado durante a leitura do documento e compacta tudo
+        self.nome = nome
+        self.palavras = sorted(postagens)
+        self.inicios = array('Q', (0,))
+        self.linhas = array('I')
+        for palavra in self.palavras:
+            self.linhas.extend(postagens[palavra])
+            self.inicios.append(len(self.linhas))
+        self.total_palavras = total_palavras
+
+    def buscar(self, palavra):
+        # Retorna o vetor com as linhas da palavra neste documento, ou None se ela não aparece nele
+        posicao = bisect_left(self.palavras, palavra)
+        if posicao < len(self.palavras) and self.palavras[posicao] == palavra:
+            return self.linhas[self.inicios[posicao]:self.inicios[posicao + 1]]
+        return None
+
+    def percorrer_prefixo(self, prefixo, limite=None):
+        # Gerador com as palavras do documento que começam com o prefixo, em ordem alfabética
+        posicao = bisect_left(self.palavras, prefixo)
+        fim = len(self.palavras) if limite is None else min(len(self.palavras), posicao + max(limite, 0))
+        while posicao < fim and self.palavras[posicao].startswith(prefixo):
+            yield self.palavras[posicao]
+            posicao += 1
+
+    def __iter__(self):
+        # Gerador com os pares (palavra, linhas) em ordem alfabética
+        for i, palavra in enumerate(self.palavras):
+            yield palavra, self.linhas[self.inicios[i]:self.inicios[i + 1]]
+
+
+class IndiceCorpus:
+    # Índice remissivo de um conjunto de documentos, com um vocabulário compartilhado
+
+    def __init__(self):
+        self.vocabulario = ArvoreAVL()  # palavra -> ids dos documentos onde ela aparece
+        self.documentos = []  # TabelaDocumento de cada id
+        self.__ids = {}  # nome do documento -> id
+
+    def adicionar_documento(self, nome, linhas):
+        # Indexa um documento a partir de um iterável de linhas (um arquivo aberto, por exemplo)
+        # As linhas são lidas uma a uma; só as postagens do documento atual ficam num dicionário temporário
+        # Retorna o id do documento
+        if nome in self.__ids:
+            raise ValueError(f"Documento já indexado: {nome}")
+
+        postagens = {}
+        total_palavras = 0
+        for palavra, numero_linha in tokenizar(linhas):
+            total_palavras += 1
+            linhas_palavra = postagens.get(palavra)
+            if linhas_palavra is None:
+                postagens[palavra] = array('I', (numero_linha,))
+            elif linhas_palavra[-1] != numero_linha:
+                linhas_palavra.append(numero_linha)
+
+        id_documento = len(self.documentos)
+        tabela = TabelaDocumento(nome, postagens, total_palavras)
+        self.documentos.append(tabela)
+        self.__ids[nome] = id_documento
+
+        # Os ids crescem a cada documento, então cada inserção só acrescenta o id no fim do vetor do nó
+        for palavra in tabela.palavras:
+            self.vocabulario.inserir(palavra, id_documento)
+        return id_documento
+
+    def id_documento(self, nome):
+        # Retorna o id de um documento pelo nome (KeyError se ele não estiver no índice)
+        return self.__ids[nome]
+
+    def __tabela(self, documento):
+        # Aceita o nome ou o id do documento
+        if isinstance(documento, int):
+            return self.documentos[documento]
+        return self.documentos[self.__ids[documento]]
+
+    def buscar(self, palavra, documento=None):
+        # Sem documento: retorna {nome do documento: linhas} com todos os documentos onde a palavra aparece
+        # (só os documentos listados no nó da palavra são consultados)
+        # Com documento (nome ou id): retorna as linhas da palavra naquele documento, ou None
+        palavra = palavra.lower()
+        if documento is not None:
+            return self.__tabela(documento).buscar(palavra)
+
+        no = self.vocabulario.buscar(palavra)
+        if not no:
+            return {}
+        resultado = {}
+        for id_documento in no.linhas:
+            tabela = self.documentos[id_documento]
+            resultado[tabela.nome] = tabela.buscar(palavra)
+        return resultado
+
+    def documentos_com(self, palavra):
+        # Retorna os nomes dos documentos onde a palavra aparece, na ordem em que foram indexados
+        no = self.vocabulario.buscar(palavra)
+        if not no:
+            return []
+        return [self.documentos[id_documento].nome for id_documento in no.linhas]
+
+    def buscar_por_prefixo(self, prefixo, documento=None, limite=None):
+        # Retorna as palavras que começam com o prefixo, em ordem alfabética
+        # Com documento, a busca é feita só na tabela daquele documento
+        prefixo = prefixo.lower()
+        if documento is not None:
+            return list(self.__tabela(documento).percorrer_prefixo(prefixo, limite))
+        return self.vocabulario.buscar_por_prefixo(prefixo, limite)
+
+    def imprimir_indice(self, documento):
+        # Retorna o índice remissivo de um documento, no mesmo formato do indice_remissivo.txt
+        return [f"{palavra} {','.join(map(str, linhas))}" for palavra, linhas in self.__tabela(documento)]
+
+    def contar_documentos(self):
+        return len(self.documentos)
+
+    def contar_palavras_distintas(self):
+        # Palavras distintas de todo o corpus
+        return self.vocabulario.contar_palavras_distintas()
+
+    def contar_palavras_total(self):
+        # Total de palavras lidas em todos os documentos
+        return sum(tabela.total_palavras for tabela in self.documentos)
+
+
+def construir_corpus(diretorio, extensao=".txt"):
+    # Indexa todos os arquivos do diretório com a extensão dada, em ordem alfabética de nome
+    # Os arquivos são lidos um de cada vez, linha por linha
+    # Retorna o IndiceCorpus; o nome de cada documento é o nome do arquivo
+    corpus = IndiceCorpus()
+    nomes = sorted(nome for nome in os.listdir(diretorio) if nome.endswith(extensao))
+    for nome in nomes:
+        with open(os.path.join(diretorio, nome), 'r', encoding='utf-8') as arquivo:
+            corpus.adicionar_documento(nome, arquivo)
+    return corpus
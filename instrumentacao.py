@@ -0,0 +1,134 @@
+# Módulo com a instrumentação opcional da ArvoreAVL
+# Ligar a instrumentação troca a classe da árvore por ArvoreAVLInstrumentada, que mede cada chamada de
+# buscar, inserir e remover; desligar volta para a ArvoreAVL.
+#
+# As visitas e comparações saem da própria operação: buscar, inserir e remover da ArvoreAVL chamam
+# _registrar uma vez no fim com o tamanho do caminho que percorreram (na ArvoreAVL ele não faz nada), e a
+# ArvoreAVLInstrumentada redefine _registrar para transformar esse caminho nos contadores. Não há outra
+# cópia das operações, então a árvore instrumentada é exatamente a mesma que a ArvoreAVL teria.
+
+import time
+
+from avl import ArvoreAVL
+
+OPERACOES = ("buscar", "inserir", "remover")
+
+
+class Estatisticas:
+    # Contadores de uma árvore instrumentada
+
+    def __init__(self, intervalo_altura=1000):
+        # intervalo_altura: a cada quantas operações a altura da árvore é registrada
+        self.intervalo_altura = intervalo_altura
+        self.operacoes = 0
+        self.chamadas = dict.fromkeys(OPERACOES, 0)
+        self.visitas = dict.fromkeys(OPERACOES, 0)  # nós visitados na descida e no caminho até o sucessor
+        # Comparações entre palavras: na descida, ao religar os nós na subida e na escolha da rotação
+        self.comparacoes = dict.fromkeys(OPERACOES, 0)
+        self.verificacoes = dict.fromkeys(OPERACOES, 0)  # nós com o balanceamento verificado na subida
+        self.tempo_ns = dict.fromkeys(OPERACOES, 0)
+        # Histograma de latência por operação: {limite superior em ns (potência de 2): chamadas}
+        self.histogramas = {operacao: {} for operacao in OPERACOES}
+        self.alturas = []  # pares (número da operação, altura da árvore)
+        self.contagem = (0, 0, 0)  # (visitas, comparações, verificações) da última operação, vinda de _registrar
+        self.callbacks = []
+
+    def registrar(self, arvore, operacao, palavra, duracao_ns, visitas, comparacoes, verificacoes):
+        # Soma uma chamada aos contadores e avisa os callbacks
+        self.operacoes += 1
+        self.chamadas[operacao] += 1
+        self.visitas[operacao] += visitas
+        self.comparacoes[operacao] += comparacoes
+        self.verificacoes[operacao] += verificacoes
+        self.tempo_ns[operacao] += duracao_ns
+
+        limite = 1 << duracao_ns.bit_length()
+        histograma = self.histogramas[operacao]
+        histograma[limite] = histograma.get(limite, 0) + 1
+
+        if self.operacoes % self.intervalo_altura == 0:
+            self.alturas.append((self.operacoes, arvore.altura()))
+
+        for callback in self.callbacks:
+            callback(operacao, palavra, duracao_ns, visitas, comparacoes)
+
+    def resumo(self, arvore):
+        # Retorna uma cópia dos contadores num dicionário, junto com as rotações e a altura atual da árvore
+        return {
+            "operacoes": self.operacoes,
+            "por_operacao": {
+                operacao: {
+                    "chamadas": self.chamadas[operacao],
+                    "visitas": self.visitas[operacao],
+                    "comparacoes": self.comparacoes[operacao],
+                    "verificacoes": self.verificacoes[operacao],
+                    "tempo_ns": self.tempo_ns[operacao],
+                    "histograma_ns": dict(sorted(self.histogramas[operacao].items())),
+                }
+                for operacao in OPERACOES
+            },
+            "rotacoes_insercao": dict(arvore.rotacoes_insercao),
+            "rotacoes_remocao": dict(arvore.rotacoes_remocao),
+            "altura": arvore.altura(),
+            "alturas": list(self.alturas),
+        }
+
+
+class ArvoreAVLInstrumentada(ArvoreAVL):
+    # Mesma árvore, com buscar, inserir e remover medidos
+    # Não é criada diretamente: instrumentar() troca a classe de uma ArvoreAVL já existente
+    # As operações são as da ArvoreAVL; no fim de cada uma, ela chama _registrar com o que percorreu e
+    # é daí que saem as visitas, as comparações e as verificações
+
+    def _registrar(self, operacao, profundidade, encontrou, subida=0, escolhas=0, sucessor=0):
+        # Converte o caminho da operação nos contadores, que buscar, inserir e remover entregam às estatísticas
+        # Na descida, cada nó diferente da palavra custa duas comparações (== e <) e o nó da palavra, uma
+        # Na subida da inserção, religar cada nó compara a palavra de novo; a remoção religa por identidade
+        comparacoes = 2 * profundidade + encontrou + escolhas
+        if operacao == "inserir":
+            comparacoes += subida
+        self.estatisticas.contagem = (profundidade + encontrou + sucessor, comparacoes, subida)
+
+    def buscar(self, palavra):
+        inicio = time.perf_counter_ns()
+        resultado = ArvoreAVL.buscar(self, palavra)
+        self.estatisticas.registrar(self, "buscar", palavra, time.perf_counter_ns() - inicio, *self.estatisticas.contagem)
+        return resultado
+
+    def inserir(self, palavra, linha):
+        inicio = time.perf_counter_ns()
+        ArvoreAVL.inserir(self, palavra, linha)
+        self.estatisticas.registrar(self, "inserir", palavra, time.perf_counter_ns() - inicio, *self.estatisticas.contagem)
+
+    def remover(self, palavra, linha=None):
+        inicio = time.perf_counter_ns()
+        resultado = ArvoreAVL.remover(self, palavra, linha)
+        self.estatisticas.registrar(self, "remover", palavra, time.perf_counter_ns() - inicio, *self.estatisticas.contagem)
+        return resultado
+
+
+def instrumentar(arvore, callback=None, intervalo_altura=1000):
+    # Liga a instrumentação de uma árvore e retorna o objeto Estatisticas dela
+    # callback (opcional) é chamado a cada operação com (operacao, palavra, duracao_ns, visitas, comparacoes)
+    if not isinstance(arvore, ArvoreAVLInstrumentada):
+        arvore.estatisticas = Estatisticas(intervalo_altura)
+        arvore.__class__ = ArvoreAVLInstrumentada
+    if callback is not None:
+        arvore.estatisticas.callbacks.append(callback)
+    return arvore.estatisticas
+
+
+def desinstrumentar(arvore):
+    # Desliga a instrumentação: a árvore volta a ser uma ArvoreAVL comum
+    # Retorna o objeto Estatisticas com o que foi medido até aqui (ou None se ela não estava instrumentada)
+    if not isinstance(arvore, ArvoreAVLInstrumentada):
+        return None
+    arvore.__class__ = ArvoreAVL
+    return arvore.__dict__.pop("estatisticas")
+
+
+def estatisticas(arvore):
+    # Retorna o resumo dos contadores de uma árvore instrumentada (ou None se ela não estiver instrumentada)
+    if not isinstance(arvore, ArvoreAVLInstrumentada):
+        return None
+    return arvore.estatisticas.resumo(arvore)
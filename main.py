@@ -4,8 +4,18 @@
 # Professora: Maria Adriana
 
 # Importando a biblioteca "time" do python para calcular o tempo de execução do programa
+import argparse
 import time
 from avl import ArvoreAVL
+from contexto import FonteMapeada, mapear_linhas
+from exportacao import exportar_indice
+from paralelo import construir_postagens_paralelo
+from persistencia import IndiceMapeado, salvar_indice_binario
+from tokenizador import tokenizar
+from vetor_ordenado import IndiceVetorOrdenado
+
+# Motores do índice, todos com a interface de indice_base.IndiceRemissivo
+MOTORES = {"avl": ArvoreAVL, "vetor": IndiceVetorOrdenado}
 
 
 def limpar_palavra(palavra):
@@ -20,60 +30,111 @@ def limpar_palavra(palavra):
     return resultado
 
 
-def construir_indice(caminho_arquivo):
+def construir_indice(caminho_arquivo, modo="avl", trabalhadores=None, motor="avl"):
     # Lê o arquivo txt e constrói a AVL com as palavras e número das linhas
+    # O modo "avl" insere palavra por palavra na árvore (com rotações)
+    # O modo "bulk" junta as linhas de cada palavra num dicionário e monta a árvore já balanceada no final
+    # O modo "paralelo" divide o arquivo entre "trabalhadores" processos e junta os resultados (ver paralelo.py)
+    # O motor escolhe a estrutura do índice (ver MOTORES); com "vetor", os modos valem do mesmo jeito
+    # Em todos os modos a árvore também guarda a posição em bytes de cada linha (inicios_linhas)
     # A função retorna a árvore, o número que representa o total de palavras e o tempo de construção/execução
-    arvore = ArvoreAVL()
+    if modo not in ("avl", "bulk", "paralelo"):
+        raise ValueError(f"Modo de construção desconhecido: {modo}")
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconhecido: {motor}")
+
+    classe = MOTORES[motor]
+    arvore = classe()
     total_palavras = 0
 
     inicio = time.time()
 
-    with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
-        for numero_linha, linha in enumerate(arquivo, start=1):
-            palavras = linha.strip().split()
+    if modo == "paralelo":
+        pares, total_palavras = construir_postagens_paralelo(caminho_arquivo, trabalhadores)
+        # Monta a árvore balanceada de uma vez, sem rotações
+        arvore = classe.from_sorted(pares)
+        arvore.palavras_descartadas = total_palavras - arvore.contar_palavras_distintas()
+    else:
+        postagens = {}
 
-            for palavra in palavras:
-                palavra_limpa = limpar_palavra(palavra).lower()
+        with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
+            for palavra, numero_linha in tokenizar(arquivo):
+                total_palavras += 1
 
-                if palavra_limpa != "":
-                    total_palavras += 1
+                if modo == "avl":
                     # Inserção na AVL
-                    arvore.inserir(palavra_limpa, numero_linha)
+                    arvore.inserir(palavra, numero_linha)
+                else:
+                    # As linhas chegam em ordem crescente, então basta olhar a última
+                    linhas = postagens.get(palavra)
+                    if linhas is None:
+                        postagens[palavra] = [numero_linha]
+                    elif linhas[-1] != numero_linha:
+                        linhas.append(numero_linha)
+
+        if modo == "bulk":
+            # Monta a árvore balanceada de uma vez, sem rotações
+            arvore = classe.from_postings(postagens)
+            arvore.palavras_descartadas = total_palavras - len(postagens)
 
     fim = time.time()
     tempo_construcao = fim - inicio
 
-    return arvore, total_palavras, tempo_construcao
-
+    # Tabela com o início de cada linha, para mostrar a palavra no contexto sem reler o arquivo
+    arvore.inicios_linhas = mapear_linhas(caminho_arquivo)
 
-def salvar_indice_em_arquivo(arvore, total_palavras, tempo_construcao):
-    # Gera o arquivo final com índice em ordem alfabética e as cinco linhas finais:
-    #  (total de palavras, total de palavras distintas, total de palavras descartadas (por serem repetidas), tempo de construção, total de rotações executadas)
+    return arvore, total_palavras, tempo_construcao
 
-    indice = arvore.imprimir_indice()
-    total_distintas = arvore.contar_palavras_distintas()
-    descartadas = arvore.palavras_descartadas
-    rotacoes = arvore.total_rotacoes
 
-    with open("indice_remissivo.txt", "w", encoding="utf-8") as arquivo:
-        for linha in indice:
-            arquivo.write(linha + "\n")
+def carregar_indice(caminho_arquivo, caminho_indice="indice_remissivo.idx", modo="avl", motor="avl"):
+    # Abre o índice binário salvo em disco, se ele ainda corresponder ao arquivo de texto, ao modo e ao motor
+    # Caso não exista, esteja corrompido, o texto tenha mudado ou ele tenha sido construído com outro modo
+    # ou outro motor, constrói o índice de novo e salva o binário
+    # Retorna o índice (um IndiceMapeado, somente leitura), o total de palavras e o tempo de construção
+    indice = IndiceMapeado.abrir(caminho_indice, caminho_arquivo, modo, motor)
+    if indice is None:
+        arvore, total_palavras, tempo_construcao = construir_indice(caminho_arquivo, modo, motor=motor)
+        salvar_indice_binario(arvore, caminho_indice, caminho_arquivo, total_palavras, tempo_construcao, modo, motor)
+        indice = IndiceMapeado(caminho_indice)
 
-        arquivo.write("\n")
-        arquivo.write(f"Número total de palavras: {total_palavras}\n")
-        arquivo.write(f"Número de palavras distintas: {total_distintas}\n")
-        arquivo.write(f"Número de palavras descartadas: {descartadas}\n")
-        arquivo.write(f"Tempo de construção do índice usando árvore AVL: {tempo_construcao:.6f}s\n")
-        arquivo.write(f"Total de rotações executadas: {rotacoes}\n")
+    return indice, indice.total_palavras, indice.tempo_construcao
 
 
-def menu():
+def salvar_indice_em_arquivo(arvore, total_palavras, tempo_construcao, destino="indice_remissivo.txt", formato="texto"):
+    # Gera o arquivo final com índice em ordem alfabética e as cinco linhas finais:
+    #  (total de palavras, total de palavras distintas, total de palavras descartadas (por serem repetidas), tempo de construção, total de rotações executadas)
+    # O destino pode ser um caminho ou um arquivo já aberto; nos formatos "csv" e "jsonl" só as entradas são escritas
+    # As entradas são escritas em blocos direto da árvore, sem montar a lista com o índice inteiro (ver exportacao.py)
+    if hasattr(destino, "write"):
+        exportar_indice(arvore, destino, formato)
+        if formato == "texto":
+            escrever_estatisticas(destino, arvore, total_palavras, tempo_construcao)
+        return
+
+    with open(destino, "w", encoding="utf-8", newline="" if formato == "csv" else None) as arquivo:
+        salvar_indice_em_arquivo(arvore, total_palavras, tempo_construcao, arquivo, formato)
+
+
+def escrever_estatisticas(arquivo, arvore, total_palavras, tempo_construcao):
+    # Escreve as cinco linhas finais do indice_remissivo.txt
+    # O índice mapeado foi construído pelo motor gravado no cabeçalho, e é o nome dele que aparece
+    motor = MOTORES[arvore.motor] if isinstance(arvore, IndiceMapeado) else arvore
+    arquivo.write("\n")
+    arquivo.write(f"Número total de palavras: {total_palavras}\n")
+    arquivo.write(f"Número de palavras distintas: {arvore.contar_palavras_distintas()}\n")
+    arquivo.write(f"Número de palavras descartadas: {arvore.palavras_descartadas}\n")
+    arquivo.write(f"Tempo de construção do índice usando {motor.nome}: {tempo_construcao:.6f}s\n")
+    arquivo.write(f"Total de rotações executadas: {arvore.total_rotacoes}\n")
+
+
+def menu(caminho="ContoDeEscola.txt", motor="avl"):
     # Menu interativo para testar as funcioanlidades exigidas
-    caminho = "ContoDeEscola.txt"
-
-    print("Construindo índice...")
-    arvore, total_palavras, tempo_construcao = construir_indice(caminho)
-    print("Índice construído com sucesso!\n")
+    # O motor é usado quando o índice precisa ser construído e na primeira remoção (ver MOTORES)
+    print("Carregando índice...")
+    arvore, total_palavras, tempo_construcao = carregar_indice(caminho, motor=motor)
+    # O texto fica mapeado em memória para mostrar as palavras no contexto (opção 6)
+    fonte = FonteMapeada(caminho, arvore.inicios_linhas)
+    print("Índice carregado com sucesso!\n")
 
     while True:
         print("\n===== MENU =====")
@@ -82,6 +143,7 @@ def menu():
         print("3 - Remover palavra ou linha")
         print("4 - Mostrar palavra mais frequente")
         print("5 - Gerar arquivo índice completo")
+        print("6 - Mostrar palavra no contexto")
         print("0 - Sair")
 
         opcao = input("Escolha uma opção: ")
@@ -96,6 +158,8 @@ def menu():
                 print("Palavra encontrada. Nó perfeitamente equilibrado (ME = 0).")
             elif resultado == 1:
                 print("Palavra encontrada. Nó NÃO está perfeitamente equilibrado.")
+            elif resultado == 2:
+                print("Palavra encontrada. O Medidor de Equilíbrio não se aplica a este motor (não é uma árvore).")
 
         elif opcao == "2":
             prefixo = input("Digite o prefixo: ").lower()
@@ -112,6 +176,12 @@ def menu():
             palavra = input("Digite a palavra para remover: ").lower()
             linha = input("Digite a linha (ou pressione Enter para remover a palavra inteira): ")
 
+            # O índice mapeado do disco é somente leitura: a primeira remoção monta o índice em memória
+            # construindo de novo com o mesmo modo e motor gravados no índice, para a estrutura (rotações e ME)
+            # ser a mesma que foi salva, e não uma árvore balanceada montada a partir da tabela
+            if isinstance(arvore, IndiceMapeado):
+                arvore = construir_indice(caminho, arvore.modo, motor=arvore.motor)[0]
+
             if linha.strip() == "":
                 sucesso = arvore.remover(palavra)
             else:
@@ -134,7 +204,18 @@ def menu():
             salvar_indice_em_arquivo(arvore, total_palavras, tempo_construcao)
             print("Arquivo 'indice_remissivo.txt' gerado com sucesso.")
 
+        elif opcao == "6":
+            palavra = input("Digite a palavra: ").lower()
+            trechos = fonte.formatar_contextos(arvore, palavra)
+
+            if trechos:
+                for trecho in trechos:
+                    print(trecho)
+            else:
+                print("Palavra não encontrada.")
+
         elif opcao == "0":
+            fonte.fechar()
             print("Encerrando programa...")
             break
 
@@ -143,4 +224,8 @@ def menu():
 
 
 if __name__ == "__main__":
-    menu()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Índice remissivo com árvore AVL.")
+    parser.add_argument("--arquivo", default="ContoDeEscola.txt")
+    parser.add_argument("--motor", choices=MOTORES, default="avl", help="estrutura do índice em memória")
+    args = parser.parse_args()
+    menu(args.arquivo, args.motor)
\ No newline at end of file
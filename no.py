@@ -1,34 +1,55 @@
 # Módulo que define a estrutura de um nó da árvore AVL.
 # Cada nó armazena uma palavra, as linhas onde ela aparece e os ponteiros para os filhos.
 
-class No:    
+from array import array
+from bisect import bisect_left, insort
+
+class No:
+    # __slots__ evita o dicionário de atributos de cada objeto, deixando o nó bem menor na memória
+    __slots__ = ("palavra", "linhas", "esquerda", "direita", "altura", "tamanho", "ocorrencias")
+
     def __init__(self, palavra, linha):
         # Inicializa um novo nó da árvore.
         # Tem como parâmetro a palavra a ser armazenada e o número da linha
 
         self.palavra = palavra.lower()  # Armazena em minúsculas
-        self.linhas = [linha]  # Lista com a primeira linha
+        self.linhas = array('I', (linha,))  # Vetor compacto de inteiros sem sinal, sempre em ordem crescente
         self.esquerda = None
         self.direita = None
         self.altura = 0  # Novo nó começa com altura 0
+        self.tamanho = 1  # Quantidade de nós na subárvore (incluindo este)
+        self.ocorrencias = 1  # Soma das linhas de todos os nós da subárvore
 
     def adicionar_linha(self, linha):
-        # Adiciona uma nova linha à lista caso ela ainda não exista
-        if linha not in self.linhas:
+        # Adiciona uma nova linha ao vetor caso ela ainda não exista
+        # Retorna True se a linha foi adicionada e False se ela já estava lá
+        # As linhas chegam em ordem crescente na construção do índice, então basta comparar com a última
+        ultima = self.linhas[-1]
+        if linha > ultima:
             self.linhas.append(linha)
+            return True
+        if linha == ultima:
+            return False
+
+        # Linha fora de ordem: procura a posição com busca binária para manter o vetor ordenado
+        posicao = bisect_left(self.linhas, linha)
+        if self.linhas[posicao] == linha:
+            return False
+        insort(self.linhas, linha, posicao)
+        return True
 
     def remover_linha(self, linha):
-        # Remove uma linha específica da lista
+        # Remove uma linha específica do vetor usando busca binária
         # Retorna (encontrou, ficou_vazia)
-        if linha in self.linhas:
-            self.linhas.remove(linha)
+        posicao = bisect_left(self.linhas, linha)
+        if posicao < len(self.linhas) and self.linhas[posicao] == linha:
+            del self.linhas[posicao]
             return True, len(self.linhas) == 0
         return False, False
     
     def __str__(self):
         # Formata a saida do nó como string
-        # Ordena a lista com os números das linhas
+        # O vetor de linhas já está sempre em ordem, então não precisa ordenar
         # Transforma todos os elementos em str
-        # Formata a saida do nó como string sem modificar a lista original - usando list comprehension
-        linhas_str = ','.join(str(l) for l in sorted(self.linhas)) 
-        return f"{self.palavra} {linhas_str}" # Formatação: "palavra x, y, z"
\ No newline at end of file
+        linhas_str = ','.join(map(str, self.linhas))
+        return f"{self.palavra} {linhas_str}" # Formatação: "palavra x, y, z"
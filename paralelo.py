@@ -0,0 +1,126 @@
+# Módulo com a construção paralela do índice remissivo
+# O arquivo é dividido em faixas de bytes que terminam sempre no fim de uma linha.
+# Cada processo lê a sua faixa uma única vez: tokeniza, monta as linhas de cada palavra (numeradas a partir
+# de 1 dentro da faixa) e conta as linhas da faixa. No final, as listas ordenadas de cada faixa são
+# intercaladas (k-way merge), já somando às linhas de cada faixa as linhas das faixas anteriores, e a árvore
+# é montada já balanceada.
+
+import heapq
+import io
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+from tokenizador import tokenizar
+
+
+def dividir_em_faixas(caminho_arquivo, partes):
+    # Divide o arquivo em até "partes" faixas de bytes [inicio, fim)
+    # Cada corte é empurrado para logo depois do próximo "\n", para nenhuma linha ficar dividida
+    tamanho = os.path.getsize(caminho_arquivo)
+    cortes = [0]
+
+    with open(caminho_arquivo, 'rb') as arquivo:
+        for i in range(1, partes):
+            posicao = max(tamanho * i // partes, cortes[-1])
+            if posicao >= tamanho:
+                break
+            arquivo.seek(posicao)
+            arquivo.readline()  # avança até o fim da linha atual
+            posicao = arquivo.tell()
+            if posicao > cortes[-1] and posicao < tamanho:
+                cortes.append(posicao)
+
+    cortes.append(tamanho)
+    return [(cortes[i], cortes[i + 1]) for i in range(len(cortes) - 1)]
+
+
+def _ler_faixa(caminho_arquivo, inicio, fim):
+    # Lê os bytes da faixa [inicio, fim) do arquivo
+    with open(caminho_arquivo, 'rb') as arquivo:
+        arquivo.seek(inicio)
+        return arquivo.read(fim - inicio)
+
+
+def _contar_linhas(dados):
+    # Conta as quebras de linha dos bytes, do mesmo jeito que o modo texto do Python:
+    # "\n", "\r\n" e "\r" sozinho encerram uma linha
+    return dados.count(b'\n') + dados.count(b'\r') - dados.count(b'\r\n')
+
+
+def _indexar_faixa(caminho_arquivo, inicio, fim):
+    # Tokeniza uma faixa do arquivo e junta as linhas de cada palavra, numeradas a partir de 1 na faixa
+    # Retorna o total de palavras, a quantidade de linhas da faixa e a lista de pares (palavra, linhas)
+    # em ordem alfabética
+    dados = _ler_faixa(caminho_arquivo, inicio, fim)
+    texto = io.TextIOWrapper(io.BytesIO(dados), encoding='utf-8')
+
+    postagens = {}
+    total_palavras = 0
+    for palavra, numero_linha in tokenizar(texto):
+        total_palavras += 1
+        linhas = postagens.get(palavra)
+        if linhas is None:
+            postagens[palavra] = array('I', (numero_linha,))
+        elif linhas[-1] != numero_linha:
+            linhas.append(numero_linha)
+
+    return total_palavras, _contar_linhas(dados), sorted(postagens.items())
+
+
+def _deslocar(lista, deslocamento):
+    # Soma o deslocamento às linhas de cada par de uma faixa
+    if not deslocamento:
+        return lista
+    somar = deslocamento.__add__
+    return ((palavra, array('I', map(somar, linhas))) for palavra, linhas in lista)
+
+
+def mesclar_postagens(listas, deslocamentos=None):
+    # Intercala listas de pares (palavra, linhas) já ordenadas, uma por faixa do arquivo
+    # deslocamentos (opcional) tem, para cada lista, quanto somar às linhas dela (as linhas das faixas anteriores)
+    # As faixas vêm na ordem do arquivo, então as linhas de uma mesma palavra são só concatenadas
+    # Gerador que produz os pares (palavra, linhas) em ordem alfabética e sem palavras repetidas
+    if deslocamentos is not None:
+        listas = [_deslocar(lista, deslocamento) for lista, deslocamento in zip(listas, deslocamentos)]
+    palavra_atual = None
+    linhas_atuais = None
+
+    for palavra, linhas in heapq.merge(*listas, key=itemgetter(0)):
+        if palavra == palavra_atual:
+            linhas_atuais.extend(linhas)
+        else:
+            if palavra_atual is not None:
+                yield palavra_atual, linhas_atuais
+            palavra_atual = palavra
+            linhas_atuais = array('I', linhas)
+
+    if palavra_atual is not None:
+        yield palavra_atual, linhas_atuais
+
+
+def construir_postagens_paralelo(caminho_arquivo, trabalhadores=None):
+    # Constrói as postagens do arquivo usando vários processos
+    # Recebe o caminho do arquivo e a quantidade de processos (None usa todos os núcleos)
+    # Retorna um gerador com os pares (palavra, linhas) em ordem alfabética e o total de palavras
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    faixas = dividir_em_faixas(caminho_arquivo, trabalhadores)
+    caminhos = [caminho_arquivo] * len(faixas)
+    inicios = [inicio for inicio, _ in faixas]
+    fins = [fim for _, fim in faixas]
+
+    # Cada faixa é lida e indexada uma única vez num processo, com a numeração local
+    with ProcessPoolExecutor(max_workers=len(faixas)) as executor:
+        resultados = list(executor.map(_indexar_faixa, caminhos, inicios, fins))
+
+    # A primeira linha de cada faixa vem depois das linhas de todas as faixas anteriores
+    deslocamentos = []
+    anteriores = 0
+    for _, quantidade, _ in resultados:
+        deslocamentos.append(anteriores)
+        anteriores += quantidade
+
+    total_palavras = sum(total for total, _, _ in resultados)
+    pares = mesclar_postagens([lista for _, _, lista in resultados], deslocamentos)
+    return pares, total_palavras
@@ -0,0 +1,377 @@
+# Módulo com o formato binário do índice remissivo em disco
+# O índice é salvo como uma tabela de palavras em ordem alfabética, com vetores de offsets
+# e as linhas de todas as palavras num único vetor compacto de inteiros de 4 bytes.
+# A leitura usa mmap: nada é convertido na abertura, cada consulta lê só os bytes que precisa.
+#
+# Layout do arquivo (little-endian):
+#   cabeçalho (ver _CABECALHO)
+#   offsets das palavras   (n + 1) x uint64  -> posição de cada palavra no bloco de palavras
+#   offsets das linhas     (n + 1) x uint64  -> posição da primeira linha de cada palavra no vetor de linhas
+#   inícios das linhas     (m + 1) x uint64  -> posição em bytes de cada linha do arquivo fonte (ver contexto.py)
+#   linhas                 total   x uint32
+#   medidores              n       x int32   -> ME de cada palavra na estrutura que foi construída
+#                                               (_ME_NAO_APLICAVEL nos motores sem ME, ver indice_base.py)
+#   ranking                n       x uint32  -> posição na tabela de cada palavra, da que aparece em mais linhas
+#                                               para a que aparece em menos (empates na ordem do motor)
+#   bloco de palavras      bytes UTF-8 das palavras, uma atrás da outra
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from avl import ArvoreAVL
+from contexto import mapear_linhas
+from indice_base import ME_NAO_APLICAVEL, IndiceRemissivo
+from no import No
+
+ASSINATURA = b"IRAVL\x00\x00\x01"
+VERSAO = 6
+
+# assinatura, versão, reservado, palavras distintas, linhas do fonte, total de palavras, palavras descartadas,
+# rotações, tempo de construção, tamanho do arquivo fonte, data de modificação do fonte (ns), sha256 do fonte,
+# modo de construção e motor (ver main.MOTORES) usados, em ASCII completados com zeros
+_CABECALHO = struct.Struct("<8sIIQQQQQdQq32s16s16s")
+
+# Valor gravado no vetor de medidores no lugar de ME_NAO_APLICAVEL (nenhuma árvore chega a esse ME)
+_ME_NAO_APLICAVEL = -(1 << 31)
+
+
+def checksum_arquivo(caminho_arquivo):
+    # Calcula o sha256 do arquivo lendo em blocos de 1 MiB
+    resumo = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            resumo.update(bloco)
+    return resumo.digest()
+
+
+def _vetor_little_endian(vetor):
+    # O arquivo é sempre little-endian; em máquinas big-endian o vetor é invertido antes de gravar
+    if sys.byteorder != "little":
+        vetor = array(vetor.typecode, vetor)
+        vetor.byteswap()
+    return vetor
+
+
+def salvar_indice_binario(arvore, caminho_indice, caminho_fonte, total_palavras, tempo_construcao=0.0,
+                          modo="avl", motor="avl"):
+    # Grava a árvore no formato binário, junto com o checksum do arquivo fonte
+    # O modo e o motor com que a árvore foi construída vão no cabeçalho: as rotações e o ME dependem deles
+    # O arquivo é escrito num temporário e só depois substitui o antigo, para nunca ficar pela metade
+    offsets_palavras = array('Q', (0,))
+    offsets_linhas = array('Q', (0,))
+    linhas = array('I')
+    # O ME de cada entrada é o da estrutura construída (a AVL com as rotações, por exemplo), não o da tabela
+    medidores = array('i', (_ME_NAO_APLICAVEL if me == ME_NAO_APLICAVEL else me for me in arvore.medidores_em_ordem()))
+    palavras = bytearray()
+    posicoes = {}
+
+    for no in arvore.nos_em_ordem():
+        posicoes[no.palavra] = len(posicoes)
+        palavras += no.palavra.encode('utf-8')
+        linhas.extend(no.linhas)
+        offsets_palavras.append(len(palavras))
+        offsets_linhas.append(len(linhas))
+
+    # O ranking vem do próprio motor, para que os empates saiam iguais aos dele
+    ranking = array('I', (posicoes[palavra] for palavra, _ in arvore.mais_frequentes(len(posicoes))))
+
+    # A tabela de linhas montada por construir_indice é reaproveitada; sem ela, o fonte é lido agora
+    inicios_linhas = arvore.inicios_linhas
+    if inicios_linhas is None:
+        inicios_linhas = mapear_linhas(caminho_fonte)
+
+    estado = os.stat(caminho_fonte)
+    cabecalho = _CABECALHO.pack(
+        ASSINATURA, VERSAO, 0, len(offsets_palavras) - 1, len(inicios_linhas) - 1, total_palavras,
+        arvore.palavras_descartadas, arvore.total_rotacoes, tempo_construcao,
+        estado.st_size, estado.st_mtime_ns, checksum_arquivo(caminho_fonte),
+        modo.encode('ascii'), motor.encode('ascii'),
+    )
+
+    temporario = caminho_indice + ".tmp"
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(cabecalho)
+        _vetor_little_endian(offsets_palavras).tofile(arquivo)
+        _vetor_little_endian(offsets_linhas).tofile(arquivo)
+        _vetor_little_endian(inicios_linhas).tofile(arquivo)
+        _vetor_little_endian(linhas).tofile(arquivo)
+        _vetor_little_endian(medidores).tofile(arquivo)
+        _vetor_little_endian(ranking).tofile(arquivo)
+        arquivo.write(palavras)
+    os.replace(temporario, caminho_indice)
+
+
+class IndiceMapeado(IndiceRemissivo):
+    # Índice remissivo somente leitura, lido direto do arquivo binário através de mmap
+    # Implementa a interface dos motores (indice_base.py) para as consultas; inserir e remover lançam
+    # TypeError, e para alterar o índice é preciso montar um motor em memória com para_arvore
+    # A busca é uma busca binária na tabela; o Medidor de Equilíbrio de cada palavra vem gravado no arquivo,
+    # porque a forma da árvore construída (com as rotações da AVL) não é a da tabela
+
+    def __init__(self, caminho_indice):
+        # Abre e mapeia o arquivo, lendo apenas o cabeçalho
+        # Lança ValueError se o arquivo não estiver no formato esperado
+        with open(caminho_indice, 'rb') as arquivo:
+            self.__mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__visoes = []
+
+        try:
+            if len(self.__mapa) < _CABECALHO.size:
+                raise ValueError("Arquivo de índice truncado")
+            (assinatura, versao, _, n, m, self.total_palavras, self.palavras_descartadas,
+             self.total_rotacoes, self.tempo_construcao, self.tamanho_fonte,
+             self.modificacao_fonte, self.checksum_fonte, modo, motor) = _CABECALHO.unpack_from(self.__mapa)
+            if assinatura != ASSINATURA or versao != VERSAO:
+                raise ValueError("Arquivo de índice em formato desconhecido")
+            self.modo = modo.rstrip(b"\x00").decode('ascii')
+            self.motor = motor.rstrip(b"\x00").decode('ascii')
+
+            posicao = _CABECALHO.size
+            self.__n = n
+            self.__offsets_palavras = self.__vetor('Q', posicao, n + 1)
+            posicao += 8 * (n + 1)
+            self.__offsets_linhas = self.__vetor('Q', posicao, n + 1)
+            posicao += 8 * (n + 1)
+            # Início de cada linha do fonte, usado por contexto.FonteMapeada
+            self.inicios_linhas = self.__vetor('Q', posicao, m + 1)
+            posicao += 8 * (m + 1)
+            total_linhas = self.__offsets_linhas[n]
+            self.__linhas = self.__vetor('I', posicao, total_linhas)
+            posicao += 4 * total_linhas
+            self.__medidores = self.__vetor('i', posicao, n)
+            posicao += 4 * n
+            self.__ranking = self.__vetor('I', posicao, n)
+            posicao += 4 * n
+            self.__inicio_palavras = posicao
+            if posicao + self.__offsets_palavras[n] != len(self.__mapa):
+                raise ValueError("Arquivo de índice truncado")
+        except (ValueError, struct.error, IndexError, UnicodeDecodeError):
+            self.fechar()
+            raise ValueError(f"Arquivo de índice inválido: {caminho_indice}")
+
+    def __vetor(self, tipo, posicao, quantidade):
+        # Retorna uma visão do trecho do mapa como vetor de inteiros, sem copiar os bytes
+        # Em máquinas big-endian o trecho é copiado e invertido
+        tamanho = array(tipo).itemsize
+        trecho = memoryview(self.__mapa)[posicao:posicao + tamanho * quantidade]
+        if len(trecho) != tamanho * quantidade:
+            trecho.release()
+            raise ValueError("Arquivo de índice truncado")
+        if sys.byteorder == "little":
+            vetor = trecho.cast(tipo)
+        else:
+            vetor = array(tipo, trecho.tobytes())
+            vetor.byteswap()
+        trecho.release()
+        self.__visoes.append(vetor)
+        return vetor
+
+    @classmethod
+    def abrir(cls, caminho_indice, caminho_fonte, modo=None, motor=None):
+        # Abre o índice só se ele existir, for válido e tiver sido gerado a partir do arquivo fonte atual
+        # Se o modo ou o motor forem informados, o índice também precisa ter sido construído com eles
+        # Retorna None caso contrário, indicando que o índice precisa ser reconstruído
+        if not os.path.exists(caminho_indice):
+            return None
+        try:
+            indice = cls(caminho_indice)
+        except ValueError:
+            return None
+
+        if ((modo is not None and indice.modo != modo) or (motor is not None and indice.motor != motor)
+                or not indice.__fonte_confere(caminho_fonte)):
+            indice.fechar()
+            return None
+        return indice
+
+    def __fonte_confere(self, caminho_fonte):
+        # Confere se o arquivo fonte é o mesmo usado para gerar o índice
+        # Tamanho diferente já basta para saber que mudou; se a data de modificação for a mesma,
+        # o arquivo não foi mexido e o sha256 nem precisa ser recalculado
+        estado = os.stat(caminho_fonte)
+        if estado.st_size != self.tamanho_fonte:
+            return False
+        if estado.st_mtime_ns == self.modificacao_fonte:
+            return True
+        return checksum_arquivo(caminho_fonte) == self.checksum_fonte
+
+    def fechar(self):
+        # Libera as visões e o mapeamento do arquivo
+        # As visões precisam ser liberadas antes, senão o mmap não pode ser fechado
+        for vetor in self.__visoes:
+            if isinstance(vetor, memoryview):
+                vetor.release()
+        self.__visoes = []
+        self.__mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    @classmethod
+    def from_sorted(cls, pares):
+        # O índice mapeado só é lido do disco: para gravar pares, monte um motor e use salvar_indice_binario
+        raise TypeError("O IndiceMapeado é somente leitura; use salvar_indice_binario")
+
+    def inserir(self, palavra, linha):
+        raise TypeError("O IndiceMapeado é somente leitura; use para_arvore para alterar o índice")
+
+    def remover(self, palavra, linha=None):
+        raise TypeError("O IndiceMapeado é somente leitura; use para_arvore para alterar o índice")
+
+    def __palavra_bytes(self, i):
+        # Retorna os bytes UTF-8 da i-ésima palavra da tabela
+        inicio = self.__inicio_palavras
+        return self.__mapa[inicio + self.__offsets_palavras[i]:inicio + self.__offsets_palavras[i + 1]]
+
+    def __no(self, i):
+        # Monta um nó avulso com a i-ésima palavra e as suas linhas
+        no = No(self.__palavra_bytes(i).decode('utf-8'), 0)
+        no.linhas = array('I', self.__linhas[self.__offsets_linhas[i]:self.__offsets_linhas[i + 1]])
+        no.ocorrencias = len(no.linhas)
+        return no
+
+    def __localizar(self, palavra):
+        # Busca binária na tabela, comparando os bytes UTF-8 (que têm a mesma ordem das strings)
+        # Retorna a posição da palavra na tabela, ou None
+        chave = palavra.lower().encode('utf-8')
+        inicio, fim = 0, self.__n - 1
+        while inicio <= fim:
+            meio = (inicio + fim) // 2
+            atual = self.__palavra_bytes(meio)
+            if chave == atual:
+                return meio
+            if chave < atual:
+                fim = meio - 1
+            else:
+                inicio = meio + 1
+        return None
+
+    def buscar(self, palavra):
+        # Busca uma palavra no índice
+        # Retorna um nó com a palavra e as linhas caso encontre e False caso contrário
+        encontrado = self.__localizar(palavra)
+        if encontrado is None:
+            return False
+        return self.__no(encontrado)
+
+    def buscar_muitos(self, palavras):
+        # Busca várias palavras de uma vez, descendo com o lote ordenado pelos intervalos da busca binária
+        # Retorna um dicionário {palavra: nó encontrado ou False}, como ArvoreAVL.buscar_muitos
+        chaves = sorted({palavra.lower().encode('utf-8') for palavra in palavras})
+        encontrados = dict.fromkeys(chaves, False)
+
+        # Pilha de (início, fim) da tabela e [primeira, última) das consultas que descem por aquele intervalo
+        pilha = [(0, self.__n - 1, 0, len(chaves))]
+        while pilha:
+            inicio, fim, primeira, ultima = pilha.pop()
+            if inicio > fim or primeira >= ultima:
+                continue
+            meio = (inicio + fim) // 2
+            atual = self.__palavra_bytes(meio)
+            corte = bisect_left(chaves, atual, primeira, ultima)
+            direita = corte
+            if corte < ultima and chaves[corte] == atual:
+                encontrados[atual] = self.__no(meio)
+                direita += 1
+            pilha.append((inicio, meio - 1, primeira, corte))
+            pilha.append((meio + 1, fim, direita, ultima))
+
+        return {palavra: encontrados[palavra.lower().encode('utf-8')] for palavra in palavras}
+
+    def percorrer_prefixo(self, prefixo, limite=None):
+        # Gerador que produz, em ordem alfabética, as palavras que começam com o prefixo
+        # Acha a primeira palavra >= prefixo com busca binária e lê a tabela em sequência a partir dela
+        chave = prefixo.lower().encode('utf-8')
+        inicio, fim = 0, self.__n
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            if self.__palavra_bytes(meio) < chave:
+                inicio = meio + 1
+            else:
+                fim = meio
+
+        if limite is not None:
+            fim = min(self.__n, inicio + max(limite, 0))
+        else:
+            fim = self.__n
+
+        while inicio < fim:
+            atual = self.__palavra_bytes(inicio)
+            if not atual.startswith(chave):
+                return
+            yield atual.decode('utf-8')
+            inicio += 1
+
+    def medidor_equilibrio(self, palavra):
+        # Retorna o Medidor de Equilíbrio (ME) da palavra, ou None se ela não estiver no índice
+        # É o ME gravado por salvar_indice_binario, o da estrutura que foi construída
+        encontrado = self.__localizar(palavra)
+        if encontrado is None:
+            return None
+        me = self.__medidores[encontrado]
+        return ME_NAO_APLICAVEL if me == _ME_NAO_APLICAVEL else me
+
+    def medidores_em_ordem(self):
+        # Gerador com o ME gravado de cada palavra, em ordem alfabética
+        for me in self.__medidores:
+            yield ME_NAO_APLICAVEL if me == _ME_NAO_APLICAVEL else me
+
+    def palavra_mais_frequente(self):
+        # Encontra a palavra que aparece em mais linhas diferentes
+        # É a primeira do ranking gravado, em O(1); no empate vale a ordem do motor que construiu o índice
+        if self.__n == 0:
+            return None, 0
+        palavra, quantidade = self.__frequencia(self.__ranking[0])
+        return [palavra, quantidade]
+
+    def mais_frequentes(self, k):
+        # Retorna as k palavras que aparecem em mais linhas, como uma lista de pares (palavra, número de linhas)
+        # Lê só as k primeiras posições do ranking gravado
+        return [self.__frequencia(i) for i in self.__ranking[:max(k, 0)]]
+
+    def reordenar_frequencias(self, ranking):
+        raise TypeError("O IndiceMapeado é somente leitura; use para_arvore para alterar o índice")
+
+    def __frequencia(self, i):
+        # Retorna o par (palavra, número de linhas) da i-ésima palavra da tabela
+        offsets = self.__offsets_linhas
+        return self.__palavra_bytes(i).decode('utf-8'), offsets[i + 1] - offsets[i]
+
+    def nos_em_ordem(self):
+        # Gerador que produz os nós avulsos em ordem alfabética, um de cada vez
+        for i in range(self.__n):
+            yield self.__no(i)
+
+    def pares(self):
+        # Gerador que produz os pares (palavra, linhas) em ordem alfabética
+        for i in range(self.__n):
+            no = self.__no(i)
+            yield no.palavra, no.linhas
+
+    def contar_palavras_total(self):
+        # Conta o total de linhas de todas as palavras
+        return self.__offsets_linhas[self.__n]
+
+    def contar_palavras_distintas(self):
+        # Conta o número de palavras distintas
+        return self.__n
+
+    def para_arvore(self, motor=ArvoreAVL):
+        # Monta uma ArvoreAVL (ou outro motor, ver indice_base.py) em memória com o conteúdo do índice
+        # A árvore é a balanceada de from_sorted, não a forma que foi construída (com as rotações da AVL);
+        # para continuar com a mesma estrutura, construa de novo com construir_indice(fonte, modo, motor=motor)
+        # Os empates de mais_frequentes são os gravados, não os da ordem alfabética de from_sorted
+        arvore = motor.from_sorted(self.pares())
+        arvore.reordenar_frequencias(self.mais_frequentes(self.__n))
+        arvore.palavras_descartadas = self.palavras_descartadas
+        arvore.total_rotacoes = self.total_rotacoes
+        arvore.inicios_linhas = array('Q', self.inicios_linhas)
+        return arvore
@@ -0,0 +1,197 @@
+# Módulo com a atualização incremental do índice remissivo
+# Guarda, para cada linha do arquivo, as palavras distintas que ela contém. Quando o arquivo muda,
+# as linhas antigas e novas são comparadas (diff) e só as linhas alteradas passam pela árvore:
+# as palavras das linhas que saíram são removidas com remover(palavra, posição), as das linhas novas
+# são inseridas com inserir.
+#
+# A árvore não guarda os números das linhas, e sim posições estáveis: cada linha recebe uma posição
+# (um inteiro de 32 bits) quando entra no índice e fica com ela enquanto existir. As posições seguem a
+# ordem das linhas, com folgas entre elas para as linhas que forem inseridas depois. O vetor ordenado
+# com as posições das linhas atuais faz a tradução: o número da linha é a posição da sua posição nesse
+# vetor (busca binária), calculado só na consulta. Inserir ou remover linhas não mexe nas linhas das
+# outras palavras; só quando uma folga acaba as posições de uma janela em volta são redistribuídas.
+
+from array import array
+from bisect import bisect_left
+from difflib import SequenceMatcher
+
+from avl import ArvoreAVL
+from no import No
+from tokenizador import tokenizar_linha
+
+# As posições vão de 1 a LIMITE - 1; 0 marca uma linha nova que ainda não recebeu posição
+LIMITE = 1 << 32
+
+
+def _assinaturas(caminho_arquivo):
+    # Lê o arquivo e retorna, para cada linha, o par (palavras distintas na ordem em que aparecem, total de palavras)
+    # É tudo que a linha contribui para o índice: mudanças só de pontuação ou de maiúsculas não contam como edição
+    assinaturas = []
+    with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            palavras = tokenizar_linha(linha)
+            assinaturas.append((tuple(dict.fromkeys(palavras)), len(palavras)))
+    return assinaturas
+
+
+class IndiceIncremental:
+    # Índice remissivo de um arquivo que pode ser atualizado depois de uma edição sem reconstruir a árvore
+    # As linhas dos nós de "arvore" são posições estáveis; buscar, imprimir_indice e para_arvore
+    # devolvem os números das linhas
+
+    def __init__(self, caminho_arquivo):
+        # Constrói o índice do arquivo, guardando as palavras de cada linha para as próximas atualizações
+        self.caminho_arquivo = caminho_arquivo
+        self.arvore = ArvoreAVL()
+        self.total_palavras = 0
+        self.__linhas = []
+        self.__posicoes = array('I')  # posição de cada linha atual, em ordem crescente
+        self.relocacoes = 0  # quantas linhas já existentes tiveram a posição redistribuída
+
+        linhas = _assinaturas(caminho_arquivo)
+        self.__aplicar([("insert", 0, 0, 0, len(linhas))], linhas)
+
+    def atualizar(self, caminho_arquivo=None):
+        # Relê o arquivo (ou outro caminho com a nova versão) e aplica na árvore só o que mudou
+        # Retorna o par (linhas removidas, linhas inseridas)
+        if caminho_arquivo is not None:
+            self.caminho_arquivo = caminho_arquivo
+        novas = _assinaturas(self.caminho_arquivo)
+        antigas = self.__linhas
+
+        # O começo e o fim iguais são descartados antes do diff, que então só olha o trecho editado
+        inicio = 0
+        limite = min(len(antigas), len(novas))
+        while inicio < limite and antigas[inicio] == novas[inicio]:
+            inicio += 1
+        fim = 0
+        while fim < limite - inicio and antigas[-1 - fim] == novas[-1 - fim]:
+            fim += 1
+
+        comparador = SequenceMatcher(None, antigas[inicio:len(antigas) - fim], novas[inicio:len(novas) - fim], autojunk=False)
+        blocos = [(tag, i1 + inicio, i2 + inicio, j1 + inicio, j2 + inicio)
+                  for tag, i1, i2, j1, j2 in comparador.get_opcodes()]
+        # Os trechos iguais do começo e do fim também entram, para as linhas que ficaram manterem a posição
+        blocos.insert(0, ("equal", 0, inicio, 0, inicio))
+        blocos.append(("equal", len(antigas) - fim, len(antigas), len(novas) - fim, len(novas)))
+
+        return self.__aplicar(blocos, novas)
+
+    def __aplicar(self, blocos, novas):
+        # Aplica na árvore os blocos do diff (no formato de SequenceMatcher.get_opcodes)
+        # 1) remove as palavras das linhas antigas que saíram, pelas posições delas
+        # 2) monta o vetor de posições das linhas novas: as que ficaram levam a posição que já tinham
+        # 3) dá posições às linhas novas, trecho a trecho, e insere as palavras delas
+        arvore = self.arvore
+        antigas = self.__posicoes
+        removidas = inseridas = 0
+
+        posicoes = array('I')
+        trechos_novos = []
+        for tag, i1, i2, j1, j2 in blocos:
+            if tag in ("replace", "delete"):
+                for numero in range(i1, i2):
+                    palavras, quantidade = self.__linhas[numero]
+                    for palavra in palavras:
+                        arvore.remover(palavra, antigas[numero])
+                    self.total_palavras -= quantidade
+                removidas += i2 - i1
+            if tag == "equal":
+                posicoes.extend(antigas[i1:i2])
+            elif j1 < j2:
+                posicoes.frombytes(bytes(posicoes.itemsize * (j2 - j1)))  # posições 0: ainda sem posição
+                trechos_novos.append((j1, j2))
+
+        self.__posicoes = posicoes
+        # Cada trecho é inserido logo depois de receber posições: uma redistribuição de um trecho seguinte
+        # pode pegar este, e precisa encontrar as palavras dele na árvore
+        for j1, j2 in trechos_novos:
+            if posicoes[j1] == 0:  # o trecho pode ter recebido posições na redistribuição de um trecho anterior
+                self.__distribuir(j1, j2, novas)
+            for numero in range(j1, j2):
+                palavras, quantidade = novas[numero]
+                for palavra in palavras:
+                    arvore.inserir(palavra, posicoes[numero])
+                self.total_palavras += quantidade
+            inseridas += j2 - j1
+
+        # Mesmo valor que uma construção do zero teria: cada palavra além da primeira ocorrência é descartada
+        arvore.palavras_descartadas = self.total_palavras - arvore.contar_palavras_distintas()
+        self.__linhas = novas
+        return removidas, inseridas
+
+    def __distribuir(self, inicio, fim, novas):
+        # Dá posições às linhas novas de [inicio, fim), entre as posições das linhas vizinhas
+        # Se a folga entre as vizinhas não bastar (no máximo metade ocupada depois), a janela dobra de tamanho
+        # em volta do trecho até bastar, e as posições de todas as linhas da janela são redistribuídas por igual
+        posicoes = self.__posicoes
+        total = len(posicoes)
+        while True:
+            while fim < total and posicoes[fim] == 0:
+                fim += 1
+            esquerda = posicoes[inicio - 1] if inicio > 0 else 0
+            direita = posicoes[fim] if fim < total else LIMITE
+            if direita - esquerda - 1 >= 2 * (fim - inicio):
+                break
+            if inicio == 0 and fim == total:
+                # A janela já é o arquivo todo: aceita passar da metade enquanto couber
+                if direita - esquerda - 1 >= fim - inicio:
+                    break
+                raise ValueError("Linhas demais para as posições de 32 bits")
+            tamanho = fim - inicio
+            inicio = max(0, inicio - tamanho)
+            fim = min(total, fim + tamanho)
+
+        # Redistribui a janela; as linhas que já estavam no índice e mudaram de posição são anotadas
+        quantidade = fim - inicio
+        espaco = direita - esquerda
+        trocas = {}
+        palavras_afetadas = set()
+        for k in range(quantidade):
+            numero = inicio + k
+            nova = esquerda + (k + 1) * espaco // (quantidade + 1)
+            antiga = posicoes[numero]
+            if antiga and antiga != nova:
+                trocas[antiga] = nova
+                palavras_afetadas.update(novas[numero][0])
+            posicoes[numero] = nova
+
+        if not trocas:
+            return
+        self.relocacoes += len(trocas)
+        # Nos vetores das palavras, as posições da janela são as únicas entre "esquerda" e "direita"
+        # e a redistribuição mantém a ordem, então basta trocar esse trecho de cada vetor
+        for palavra in palavras_afetadas:
+            linhas = self.arvore.buscar(palavra).linhas
+            primeira = bisect_left(linhas, esquerda + 1)
+            ultima = bisect_left(linhas, direita)
+            for i in range(primeira, ultima):
+                linhas[i] = trocas.get(linhas[i], linhas[i])
+
+    def numero_linha(self, posicao):
+        # Traduz a posição estável de uma linha para o número atual da linha
+        return bisect_left(self.__posicoes, posicao) + 1
+
+    def buscar(self, palavra):
+        # Retorna um nó avulso com a palavra e os números atuais das suas linhas, ou False, como ArvoreAVL.buscar
+        no = self.arvore.buscar(palavra)
+        if not no:
+            return False
+        resultado = No(no.palavra, 0)
+        resultado.linhas = array('I', map(self.numero_linha, no.linhas))
+        return resultado
+
+    def pares(self):
+        # Gerador com os pares (palavra, números das linhas) em ordem alfabética
+        for no in self.arvore:
+            yield no.palavra, array('I', map(self.numero_linha, no.linhas))
+
+    def imprimir_indice(self):
+        # Retorna o índice remissivo completo em ordem alfabética, como uma lista de string
+        return [f"{palavra} {','.join(map(str, linhas))}" for palavra, linhas in self.pares()]
+
+    def para_arvore(self):
+        # Monta uma ArvoreAVL com os números atuais das linhas (para exportar ou salvar o índice)
+        arvore = ArvoreAVL.from_sorted(self.pares())
+        arvore.palavras_descartadas = self.arvore.palavras_descartadas
+        return arvore
@@ -0,0 +1,209 @@
+# Servidor local de consultas ao índice remissivo, com asyncio
+# Protocolo: cada pedido é um objeto JSON numa linha e cada resposta volta numa linha, na mesma ordem
+# dos pedidos da conexão. O cliente pode mandar vários pedidos sem esperar as respostas (pipelining).
+#
+# Pedidos (o campo "id", se enviado, volta na resposta):
+#   {"op": "buscar", "palavra": "escola"}
+#   {"op": "prefixo", "prefixo": "esc", "limite": 10}
+#   {"op": "equilibrio", "palavra": "escola"}     -> "me": o ME, null se a palavra não existe ou
+#                                                   "não se aplica" num motor que não é árvore
+#   {"op": "mais_frequente"}            ou  {"op": "mais_frequente", "k": 20}
+#   {"op": "remover", "palavra": "escola"}  ou  {"op": "remover", "palavra": "escola", "linha": 2}
+#
+# Todos os pedidos, de todas as conexões, passam por uma única fila. Uma só tarefa consome a fila e é a
+# única que mexe na árvore: as remoções são executadas uma de cada vez, na ordem de chegada, e nunca no
+# meio de outra operação. As leituras que chegam juntas entre duas remoções são atendidas em lote (as
+# buscas exatas do lote saem de um único buscar_muitos).
+#
+# Uso: python servidor.py --arquivo ContoDeEscola.txt --porta 8765
+
+import argparse
+import asyncio
+import json
+
+from main import MOTORES, construir_indice
+
+LEITURAS = ("buscar", "prefixo", "equilibrio", "mais_frequente")
+ESCRITAS = ("remover",)
+
+
+def _inteiro(pedido, campo, padrao=None):
+    # Retorna o campo do pedido como inteiro (ou o padrão, se ele não vier)
+    # Lança ValueError para qualquer outro tipo: 2.0, "2", true e 1e400 não são linhas nem quantidades
+    valor = pedido.get(campo, padrao)
+    if valor is padrao:
+        return valor
+    if type(valor) is not int:
+        raise ValueError(f"o campo '{campo}' precisa ser um número inteiro")
+    return valor
+
+
+def _resolver(futuro, resposta):
+    # Entrega a resposta, a menos que o futuro já tenha sido resolvido ou cancelado
+    if not futuro.done():
+        futuro.set_result(resposta)
+
+
+class ServidorIndice:
+    # Servidor TCP que atende consultas a uma ArvoreAVL
+
+    def __init__(self, arvore):
+        self.arvore = arvore
+        self.__fila = None
+        self.__despachante = None
+        self.__servidor = None
+
+    async def iniciar(self, host="127.0.0.1", porta=8765):
+        # Começa a aceitar conexões e retorna o asyncio.Server (porta 0 escolhe uma porta livre)
+        self.__fila = asyncio.Queue()
+        self.__despachante = asyncio.create_task(self.__despachar())
+        self.__servidor = await asyncio.start_server(self.__atender, host, porta)
+        return self.__servidor
+
+    async def fechar(self):
+        # Para de aceitar conexões e encerra a tarefa que atende a fila
+        self.__servidor.close()
+        await self.__servidor.wait_closed()
+        self.__despachante.cancel()
+
+    async def __atender(self, leitor, escritor):
+        # Lê os pedidos de uma conexão e coloca cada um na fila, sem esperar a resposta do anterior
+        # As respostas são escritas por outra tarefa, na ordem em que os pedidos chegaram
+        loop = asyncio.get_running_loop()
+        pendentes = asyncio.Queue()
+        tarefa_respostas = asyncio.create_task(self.__responder(pendentes, escritor))
+        try:
+            while linha := await leitor.readline():
+                futuro = loop.create_future()
+                try:
+                    pedido = json.loads(linha)
+                    if not isinstance(pedido, dict):
+                        raise ValueError
+                except ValueError:
+                    futuro.set_result({"erro": "pedido inválido: esperado um objeto JSON por linha"})
+                else:
+                    self.__fila.put_nowait((pedido, futuro))
+                await pendentes.put(futuro)
+        except ConnectionError:
+            pass
+        finally:
+            await pendentes.put(None)
+            await tarefa_respostas
+            escritor.close()
+
+    async def __responder(self, pendentes, escritor):
+        # Escreve as respostas de uma conexão, na ordem dos pedidos
+        # Só espera o buffer de saída esvaziar quando não há mais respostas prontas para mandar
+        try:
+            while (futuro := await pendentes.get()) is not None:
+                resposta = await futuro
+                escritor.write(json.dumps(resposta, ensure_ascii=False).encode('utf-8') + b"\n")
+                if pendentes.empty():
+                    await escritor.drain()
+        except ConnectionError:
+            while await pendentes.get() is not None:
+                pass
+
+    async def __despachar(self):
+        # Tarefa única que consome a fila: pega tudo o que já chegou e atende como um lote
+        while True:
+            lote = [await self.__fila.get()]
+            while not self.__fila.empty():
+                lote.append(self.__fila.get_nowait())
+            self.executar_lote(lote)
+
+    def executar_lote(self, lote):
+        # Atende uma lista de (pedido, futuro) na ordem de chegada
+        # Cada trecho de leituras seguidas é atendido de uma vez; as escritas ficam entre os trechos
+        # Nunca lança exceção: um pedido com erro recebe {"erro": ...} e os outros seguem normalmente,
+        # porque uma exceção aqui encerraria a única tarefa que atende a fila
+        i = 0
+        while i < len(lote):
+            if lote[i][0].get("op") in ESCRITAS:
+                pedido, futuro = lote[i]
+                _resolver(futuro, self.__atender_pedido(pedido, None))
+                i += 1
+                continue
+
+            fim = i
+            while fim < len(lote) and lote[fim][0].get("op") not in ESCRITAS:
+                fim += 1
+            trecho = lote[i:fim]
+
+            palavras = [pedido["palavra"] for pedido, _ in trecho
+                        if pedido.get("op") == "buscar" and isinstance(pedido.get("palavra"), str)]
+            try:
+                encontrados = self.arvore.buscar_muitos(palavras) if palavras else {}
+            except Exception:
+                # Sem o lote, cada busca é feita sozinha e o erro, se houver, vai só para o pedido dela
+                encontrados = {}
+            for pedido, futuro in trecho:
+                _resolver(futuro, self.__atender_pedido(pedido, encontrados))
+            i = fim
+
+    def __atender_pedido(self, pedido, encontrados):
+        # Executa um pedido e monta a resposta; qualquer erro vira {"erro": ...} só para este pedido
+        try:
+            resposta = self.__executar(pedido, encontrados)
+        except Exception as erro:
+            resposta = {"erro": f"pedido inválido: {erro!r}"}
+        if "id" in pedido:
+            resposta["id"] = pedido["id"]
+        return resposta
+
+    def __executar(self, pedido, encontrados):
+        operacao = pedido.get("op")
+        arvore = self.arvore
+
+        if operacao == "buscar":
+            palavra = pedido["palavra"]
+            no = encontrados[palavra] if encontrados and palavra in encontrados else arvore.buscar(palavra)
+            return {"palavra": palavra.lower(), "linhas": no.linhas.tolist() if no else None}
+
+        if operacao == "prefixo":
+            return {"palavras": arvore.buscar_por_prefixo(pedido["prefixo"], _inteiro(pedido, "limite"))}
+
+        if operacao == "equilibrio":
+            return {"palavra": pedido["palavra"].lower(), "me": arvore.medidor_equilibrio(pedido["palavra"])}
+
+        if operacao == "mais_frequente":
+            if "k" in pedido:
+                k = _inteiro(pedido, "k")
+                return {"palavras": [[palavra, quantidade] for palavra, quantidade in arvore.mais_frequentes(k)]}
+            palavra, quantidade = arvore.palavra_mais_frequente()
+            return {"palavra": palavra, "linhas": quantidade}
+
+        if operacao == "remover":
+            return {"removido": arvore.remover(pedido["palavra"], _inteiro(pedido, "linha"))}
+
+        raise ValueError(f"operação desconhecida: {operacao}")
+
+
+async def servir(caminho_arquivo, host, porta, modo, motor="avl"):
+    # Constrói o índice e atende até o processo ser interrompido
+    arvore, total_palavras, tempo_construcao = construir_indice(caminho_arquivo, modo, motor=motor)
+    servidor = ServidorIndice(arvore)
+    tcp = await servidor.iniciar(host, porta)
+    enderecos = ", ".join(str(socket.getsockname()) for socket in tcp.sockets)
+    print(f"Índice com {total_palavras} palavras construído em {tempo_construcao:.3f}s. Atendendo em {enderecos}")
+    async with tcp:
+        await tcp.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de consultas ao índice remissivo.")
+    parser.add_argument("--arquivo", default="ContoDeEscola.txt")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--modo", choices=("avl", "bulk", "paralelo"), default="avl", help="modo de construção do índice")
+    parser.add_argument("--motor", choices=MOTORES, default="avl", help="estrutura do índice em memória")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(servir(args.arquivo, args.host, args.porta, args.modo, args.motor))
+    except KeyboardInterrupt:
+        print("Encerrando servidor...")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Testes do tokenizador: a saída tem que ser a mesma, palavra por palavra, do laço original
+# com limpar_palavra sobre linha.strip().split()
+# Para rodar: python -m unittest test_tokenizador
+
+import os
+import unittest
+
+from main import limpar_palavra
+from tokenizador import tokenizar, tokenizar_linha
+
+CAMINHO_CONTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ContoDeEscola.txt")
+
+
+def tokenizar_original(linhas):
+    # O laço de construir_indice antes do tokenizador: pares (palavra, número da linha)
+    for numero_linha, linha in enumerate(linhas, start=1):
+        for palavra in linha.strip().split():
+            palavra_limpa = limpar_palavra(palavra).lower()
+            if palavra_limpa != "":
+                yield palavra_limpa, numero_linha
+
+
+class TestTokenizador(unittest.TestCase):
+
+    def test_conto_de_escola(self):
+        with open(CAMINHO_CONTO, 'r', encoding='utf-8') as arquivo:
+            esperado = list(tokenizar_original(arquivo))
+        with open(CAMINHO_CONTO, 'r', encoding='utf-8') as arquivo:
+            obtido = list(tokenizar(arquivo))
+        self.assertTrue(esperado)
+        self.assertEqual(obtido, esperado)
+
+    def test_casos_de_borda(self):
+        linhas = [
+            "Escola, ESCOLA! escola...",
+            "d'água guarda-chuva 1984 -- ...",
+            "Ç Ñ Ü ÿ É à",
+            "palavra separada\ttab  dois espaços",
+            "",
+            "   ",
+            "x² ½ ß Ø ﬁm",
+        ]
+        self.assertEqual(list(tokenizar(linhas)), list(tokenizar_original(linhas)))
+        for linha in linhas:
+            esperado = [palavra for palavra, _ in tokenizar_original([linha])]
+            self.assertEqual(tokenizar_linha(linha), esperado)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+# Módulo com o tokenizador usado na construção do índice
+# Faz o mesmo que limpar_palavra (main.py), mas processa a linha inteira de uma vez com uma expressão regular pré-compilada
+
+import re
+
+# Letras aceitas nas palavras (inclusive acentuadas), as mesmas de limpar_palavra
+LETRAS = "abcdefghijklmnopqrstuvwxyzáàãâäéèêëíìîïóòõôöúùûüýÿçñ"
+
+# Tudo que não é letra aceita nem espaço em branco é apagado antes de separar as palavras
+# Apagar esses caracteres dentro da palavra equivale a limpar cada palavra separadamente,
+# já que os espaços (que definem onde uma palavra termina) são mantidos
+_NAO_LETRAS = re.compile(f"[^{LETRAS}\\s]+")
+
+
+def tokenizar_linha(linha):
+    # Recebe uma linha de texto e retorna a lista de palavras limpas e em minúsculas
+    return _NAO_LETRAS.sub("", linha.lower()).split()
+
+
+def tokenizar(linhas, inicio=1):
+    # Gerador que recebe um iterável de linhas (um arquivo aberto, por exemplo)
+    # e produz os pares (palavra, número da linha) na ordem em que aparecem no texto
+    # O parâmetro inicio é o número da primeira linha
+    sub = _NAO_LETRAS.sub
+    for numero_linha, linha in enumerate(linhas, start=inicio):
+        for palavra in sub("", linha.lower()).split():
+            yield palavra, numero_linha
@@ -0,0 +1,239 @@
+# Módulo com o motor de vetores ordenados do índice remissivo
+# As palavras ficam em listas ordenadas de até 2 * CARGA palavras (blocos), com as linhas de cada palavra
+# numa lista paralela. Uma terceira lista guarda a primeira palavra de cada bloco: a busca é uma busca
+# binária nessa lista e outra dentro do bloco (as duas com bisect, em C), como numa árvore B de dois níveis
+# com nós largos. Não há um objeto por palavra ligado por ponteiros: percorrer o índice em ordem é ler os
+# blocos em sequência, e inserir uma palavra nova só desloca os itens de um bloco.
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import repeat
+
+from indice_base import ME_NAO_APLICAVEL, Frequencias, IndiceRemissivo
+from no import No
+
+# Tamanho de referência dos blocos: um bloco é dividido ao passar de 2 * CARGA palavras
+# e juntado ao vizinho ao ficar com menos de CARGA // 2
+CARGA = 512
+
+
+def _no(palavra, linhas):
+    # Nó avulso com a palavra e o próprio vetor de linhas do índice (como os nós da ArvoreAVL)
+    # Os outros campos são os de uma folha: sem filhos, altura 0, tamanho 1 e as ocorrências do próprio nó
+    no = No.__new__(No)
+    no.palavra = palavra
+    no.linhas = linhas
+    no.esquerda = None
+    no.direita = None
+    no.altura = 0
+    no.tamanho = 1
+    no.ocorrencias = len(linhas)
+    return no
+
+
+class IndiceVetorOrdenado(IndiceRemissivo):
+    # Índice remissivo em vetores ordenados, com a mesma interface da ArvoreAVL (ver indice_base.py)
+
+    nome = "vetores ordenados"
+
+    def __init__(self):
+        self.__palavras = []  # blocos de palavras em ordem alfabética
+        self.__linhas = []  # para cada bloco, os vetores de linhas das palavras, na mesma posição
+        self.__primeiras = []  # primeira palavra de cada bloco
+        self.__distintas = 0
+        self.__ocorrencias = 0  # soma das linhas de todas as palavras
+        self.__frequencias = Frequencias()
+        self.total_rotacoes = 0  # sempre 0: não há rotações
+        self.palavras_descartadas = 0
+        self.inicios_linhas = None
+
+    @classmethod
+    def from_sorted(cls, pares):
+        # Monta os blocos direto a partir dos pares (palavra, linhas) em ordem alfabética e sem repetições
+        indice = cls()
+        palavras, linhas = [], []
+        for palavra, linhas_palavra in pares:
+            if len(palavras) == CARGA:
+                indice.__acrescentar_bloco(palavras, linhas)
+                palavras, linhas = [], []
+            palavras.append(palavra)
+            linhas.append(array('I', linhas_palavra))
+            indice.__ocorrencias += len(linhas_palavra)
+            indice.__frequencias.mudar(palavra, 0, len(linhas_palavra))
+        if palavras:
+            indice.__acrescentar_bloco(palavras, linhas)
+        return indice
+
+    def __acrescentar_bloco(self, palavras, linhas):
+        self.__palavras.append(palavras)
+        self.__linhas.append(linhas)
+        self.__primeiras.append(palavras[0])
+        self.__distintas += len(palavras)
+
+    def __localizar(self, palavra):
+        # Retorna (bloco, posição) da primeira palavra >= palavra; o índice não pode estar vazio
+        bloco = bisect_right(self.__primeiras, palavra) - 1
+        if bloco < 0:
+            bloco = 0
+        return bloco, bisect_left(self.__palavras[bloco], palavra)
+
+    def __ajustar(self, bloco):
+        # Divide o bloco que ficou grande demais ou junta ao vizinho o que ficou pequeno demais
+        palavras = self.__palavras[bloco]
+        if len(palavras) > 2 * CARGA:
+            linhas = self.__linhas[bloco]
+            self.__palavras.insert(bloco + 1, palavras[CARGA:])
+            self.__linhas.insert(bloco + 1, linhas[CARGA:])
+            self.__primeiras.insert(bloco + 1, palavras[CARGA])
+            del palavras[CARGA:]
+            del linhas[CARGA:]
+        elif len(palavras) < CARGA // 2 and len(self.__palavras) > 1:
+            if bloco == len(self.__palavras) - 1:
+                bloco -= 1
+            # Junta o bloco seguinte a este e divide de novo se o resultado passar do limite
+            self.__palavras[bloco].extend(self.__palavras.pop(bloco + 1))
+            self.__linhas[bloco].extend(self.__linhas.pop(bloco + 1))
+            del self.__primeiras[bloco + 1]
+            self.__ajustar(bloco)
+
+    def inserir(self, palavra, linha):
+        # Insere uma palavra e sua linha no índice
+        palavra = palavra.lower()
+        if not self.__palavras:
+            self.__acrescentar_bloco([palavra], [array('I', (linha,))])
+            self.__ocorrencias += 1
+            self.__frequencias.mudar(palavra, 0, 1)
+            return
+
+        bloco, posicao = self.__localizar(palavra)
+        palavras = self.__palavras[bloco]
+        if posicao < len(palavras) and palavras[posicao] == palavra:
+            # A palavra já existe: só adiciona a linha, como No.adicionar_linha
+            self.palavras_descartadas += 1
+            linhas = self.__linhas[bloco][posicao]
+            if linha > linhas[-1]:
+                linhas.append(linha)
+            else:
+                encontrada = bisect_left(linhas, linha)
+                if linhas[encontrada] == linha:
+                    return
+                insort(linhas, linha, encontrada)
+            self.__ocorrencias += 1
+            self.__frequencias.mudar(palavra, len(linhas) - 1, len(linhas))
+            return
+
+        palavras.insert(posicao, palavra)
+        self.__linhas[bloco].insert(posicao, array('I', (linha,)))
+        if posicao == 0:
+            self.__primeiras[bloco] = palavra
+        self.__distintas += 1
+        self.__ocorrencias += 1
+        self.__frequencias.mudar(palavra, 0, 1)
+        if len(palavras) > 2 * CARGA:
+            self.__ajustar(bloco)
+
+    def remover(self, palavra, linha=None):
+        # Remove uma palavra ou uma linha específica de uma palavra
+        # Retorna True se for bem sucedido, False se contrário
+        palavra = palavra.lower()
+        if not self.__palavras:
+            return False
+        bloco, posicao = self.__localizar(palavra)
+        palavras = self.__palavras[bloco]
+        if posicao == len(palavras) or palavras[posicao] != palavra:
+            return False
+
+        linhas = self.__linhas[bloco][posicao]
+        if linha is not None:
+            encontrada = bisect_left(linhas, linha)
+            if encontrada == len(linhas) or linhas[encontrada] != linha:
+                return False
+            if len(linhas) > 1:
+                del linhas[encontrada]
+                self.__ocorrencias -= 1
+                self.__frequencias.mudar(palavra, len(linhas) + 1, len(linhas))
+                return True
+
+        # Remove a palavra inteira
+        self.__frequencias.mudar(palavra, len(linhas), 0)
+        self.__ocorrencias -= len(linhas)
+        self.__distintas -= 1
+        del palavras[posicao]
+        del self.__linhas[bloco][posicao]
+        if not palavras:
+            del self.__palavras[bloco]
+            del self.__linhas[bloco]
+            del self.__primeiras[bloco]
+            return True
+        if posicao == 0:
+            self.__primeiras[bloco] = palavras[0]
+        if len(palavras) < CARGA // 2:
+            self.__ajustar(bloco)
+        return True
+
+    def buscar(self, palavra):
+        # Retorna o nó da palavra caso encontre e False caso contrário
+        palavra = palavra.lower()
+        if not self.__palavras:
+            return False
+        bloco, posicao = self.__localizar(palavra)
+        palavras = self.__palavras[bloco]
+        if posicao < len(palavras) and palavras[posicao] == palavra:
+            return _no(palavra, self.__linhas[bloco][posicao])
+        return False
+
+    def percorrer_prefixo(self, prefixo, limite=None):
+        # Gerador que produz, em ordem alfabética, as palavras que começam com o prefixo
+        # Acha a primeira palavra >= prefixo e lê os blocos em sequência a partir dela
+        prefixo = prefixo.lower()
+        if not self.__palavras or (limite is not None and limite <= 0):
+            return
+
+        bloco, posicao = self.__localizar(prefixo)
+        encontradas = 0
+        while bloco < len(self.__palavras):
+            palavras = self.__palavras[bloco]
+            for i in range(posicao, len(palavras)):
+                palavra = palavras[i]
+                if not palavra.startswith(prefixo):
+                    return
+                yield palavra
+
+                encontradas += 1
+                if encontradas == limite:
+                    return
+            bloco += 1
+            posicao = 0
+
+    def medidor_equilibrio(self, palavra):
+        # Não há nós com subárvores: para as palavras do índice retorna ME_NAO_APLICAVEL (ver indice_base.py),
+        # e None se a palavra não estiver no índice
+        return ME_NAO_APLICAVEL if self.buscar(palavra) else None
+
+    def medidores_em_ordem(self):
+        # ME_NAO_APLICAVEL para cada palavra, em ordem alfabética
+        return repeat(ME_NAO_APLICAVEL, self.__distintas)
+
+    def palavra_mais_frequente(self):
+        # Retorna [palavra, número de linhas] em O(1), ou a tupla (None, 0) se o índice estiver vazio
+        return self.__frequencias.mais_frequente()
+
+    def mais_frequentes(self, k):
+        # Retorna as k palavras que aparecem em mais linhas, como uma lista de pares (palavra, número de linhas)
+        return self.__frequencias.mais_frequentes(k)
+
+    def reordenar_frequencias(self, ranking):
+        # Troca a ordem de desempate das palavras mais frequentes pela ordem de ranking (ver indice_base.py)
+        self.__frequencias.reordenar(ranking)
+
+    def nos_em_ordem(self):
+        # Gerador que produz os nós avulsos em ordem alfabética, lendo os blocos em sequência
+        for palavras, linhas in zip(self.__palavras, self.__linhas):
+            for palavra, linhas_palavra in zip(palavras, linhas):
+                yield _no(palavra, linhas_palavra)
+
+    def contar_palavras_total(self):
+        return self.__ocorrencias
+
+    def contar_palavras_distintas(self):
+        return self.__distintas